@@ -20,7 +20,7 @@ from securecrt_tools import utilities
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -48,9 +48,10 @@ def script_main(script):
         # Set couters
         count = 0
         skipped = 0
+        new_sessions = []
 
-        # Open our input file
-        with open(sessions_csv, 'rb') as csv_import_file:
+        # Open our input file (binary mode for the csv module, with a 1MB read buffer)
+        with open(sessions_csv, 'rb', 1024 * 1024) as csv_import_file:
             # Read in CSV as DICT
             import_reader = csv.DictReader(csv_import_file)
             # Process each row and create the session
@@ -68,10 +69,13 @@ def script_main(script):
                 # If folder is blank set to '_imports'
                 if row['folder'] == "":
                     row['folder'] = "_imports"
-                # Create Session
-                script.create_new_saved_session(row['session_name'], row['hostname'], row['protocol'], row['folder'])
+                # Queue the session to be created
+                new_sessions.append((row['session_name'], row['hostname'], row['protocol'], row['folder']))
                 count += 1
 
+        # Create all of the sessions at once
+        script.create_new_saved_sessions(new_sessions)
+
         # Display summary of created / skipped sessions
         setting_msg = "{0} sessions created\n{1} sessions skipped (no Hostname / IP)".format(count, skipped)
         script.message_box(setting_msg, "Sessions Created", scripts.ICON_INFO)
@@ -82,9 +86,9 @@ def script_main(script):
         if result == scripts.IDNO:
             return
         else:
-            # Create an example input filename by replacing .py in script
-            # name with .csv
-            example_file = os.path.normpath(os.path.join(script_dir, script_name.replace(".py", ".csv")))
+            # Create an example input filename by replacing the .py extension
+            # of the script name with .csv
+            example_file = os.path.normpath(os.path.join(script_dir, os.path.splitext(script_name)[0] + ".csv"))
 
             # Write out example
             with open(example_file, 'wb') as ex_file:
@@ -23,7 +23,7 @@ from s_add_global_config import add_commands
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ##################################################
@@ -123,42 +123,30 @@ def script_main(script):
     # Create a filename to keep track of our connection logs, if we have failures.  Use script name without extension
     failed_log = session.create_output_filename("{0}-LOG".format(script_name.split(".")[0]), include_hostname=False)
 
-    for device in device_list:
+    # Each device is connected in its own tab, which is disconnected and closed when the loop moves on to the next
+    # device.  Devices without a 'Proxy Session' of their own use the default proxy, if one is set.
+    default_proxy = default_proxy_session if use_proxy else None
+    for device, session in script.ssh_in_new_tabs(device_list, proxy=default_proxy):
         hostname = device['Hostname']
-        protocol = device['Protocol']
-        username = device['Username']
-        password = device['Password']
         enable = device['Enable']
-        try:
-            proxy = device['Proxy Session']
-        except KeyError:
-            proxy = None
 
-        if not proxy and use_proxy:
-            proxy = default_proxy_session
+        if not session:
+            with open(failed_log, 'a') as logfile:
+                logfile.write("<M_SCRIPT> Connect to {0} failed.\n".format(hostname))
+            continue
 
-        logger.debug("<M_SCRIPT> Connecting to {0}.".format(hostname))
+        logger.debug("<M_SCRIPT> Connected to %s.", hostname)
         try:
-            script.connect(hostname, username, password, protocol=protocol, proxy=proxy)
-            session = script.get_main_session()
             per_device_work(session, check_mode, enable, settings_header)
-            script.disconnect()
-        except scripts.ConnectError as e:
-            with open(failed_log, 'a') as logfile:
-                logfile.write("<M_SCRIPT> Connect to {0} failed: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.InteractionError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Failure on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.UnsupportedOSError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Unsupported OS on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except Exception as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Exception on {0}: {1} ({2})\n".format(hostname, e.message.strip(), e))
-                session.disconnect()
 
     # #########################################  END DEVICE CONNECT LOOP  ############################################
 
@@ -175,7 +163,7 @@ def per_device_work(session, check_mode, enable_pass, settings_header):
     session.start_cisco_session(enable_pass=enable_pass)
 
     commands_to_add = session.script.settings.getlist(settings_header, session.os)
-    logger.debug("<ADD_GLOBAL_CONFIG> Commands to send:\n{}".format(str(commands_to_add)))
+    logger.debug("<ADD_GLOBAL_CONFIG> Commands to send:\n%s", commands_to_add)
     if commands_to_add:
         add_commands(session, check_mode, commands_to_add)
     else:
@@ -190,10 +178,14 @@ def per_device_work(session, check_mode, enable_pass, settings_header):
 if __name__ == "__builtin__":
     # Initialize script object
     crt_script = scripts.CRTScript(crt)
-    # Run script's main logic against the script object
-    script_main(crt_script)
-    # Shutdown logging after
-    logging.shutdown()
+    try:
+        # Run script's main logic against the script object
+        script_main(crt_script)
+    finally:
+        # Disconnect any connections that were kept open for reuse, even if the script failed
+        crt_script.close_connection_pool()
+        # Shutdown logging after
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -23,7 +23,7 @@ from s_document_device import document
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ##################################################
@@ -125,16 +125,12 @@ def script_main(script):
     # Create a filename to keep track of our connection logs, if we have failures.  Use script name without extension
     failed_log = session.create_output_filename("{0}-LOG".format(script_name.split(".")[0]), include_hostname=False)
 
-    for device in device_list:
+    # Each device is connected in its own tab, which is disconnected and closed when the loop moves on to the next
+    # device.  Devices without a 'Proxy Session' of their own use the default proxy, if one is set.
+    default_proxy = default_proxy_session if use_proxy else None
+    for device, session in script.ssh_in_new_tabs(device_list, proxy=default_proxy):
         hostname = device['Hostname']
-        protocol = device['Protocol']
-        username = device['Username']
-        password = device['Password']
         enable = device['Enable']
-        try:
-            proxy = device['Proxy Session']
-        except KeyError:
-            proxy = None
         try:
             if device['Command List']:
                 command_list = device['Command List']
@@ -143,31 +139,23 @@ def script_main(script):
         except KeyError:
             command_list = default_command_list
 
-        if not proxy and use_proxy:
-            proxy = default_proxy_session
+        if not session:
+            with open(failed_log, 'a') as logfile:
+                logfile.write("<M_SCRIPT> Connect to {0} failed.\n".format(hostname))
+            continue
 
-        logger.debug("<M_SCRIPT> Connecting to {0}.".format(hostname))
+        logger.debug("<M_SCRIPT> Connected to %s.", hostname)
         try:
-            script.connect(hostname, username, password, protocol=protocol, proxy=proxy)
-            session = script.get_main_session()
             per_device_work(session, enable, command_list, folder_per_device)
-            script.disconnect()
-        except scripts.ConnectError as e:
-            with open(failed_log, 'a') as logfile:
-                logfile.write("<M_SCRIPT> Connect to {0} failed: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.InteractionError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Failure on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.UnsupportedOSError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Unsupported OS on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except Exception as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Exception on {0}: {1} ({2})\n".format(hostname, e.message.strip(), e))
-                session.disconnect()
 
     # #########################################  END DEVICE CONNECT LOOP  ############################################
 
@@ -195,10 +183,14 @@ def per_device_work(session, enable_pass, command_list_name, folder_per_device):
 if __name__ == "__builtin__":
     # Initialize script object
     crt_script = scripts.CRTScript(crt)
-    # Run script's main logic against the script object
-    script_main(crt_script)
-    # Shutdown logging after
-    logging.shutdown()
+    try:
+        # Run script's main logic against the script object
+        script_main(crt_script)
+    finally:
+        # Disconnect any connections that were kept open for reuse, even if the script failed
+        crt_script.close_connection_pool()
+        # Shutdown logging after
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
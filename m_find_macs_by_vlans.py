@@ -23,7 +23,7 @@ from securecrt_tools.message_box_const import *
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ##################################################
@@ -76,26 +76,21 @@ def script_main(script):
     with open(output_filename, 'w') as output_file:
         output_file.write("MAC ADDRESS SEARCH IN VLANS: {0}\n\n".format(num_string))
         # ########################################  START DEVICE CONNECT LOOP  ###########################################
-        for device in device_list:
+        # Each device is connected in its own tab, which is disconnected and closed when the loop moves on to the next
+        # device.  Devices without a 'Proxy Session' of their own use the default proxy, if one is set.
+        default_proxy = default_proxy_session if use_proxy else None
+        for device, session in script.ssh_in_new_tabs(device_list, proxy=default_proxy):
             hostname = device['Hostname']
-            protocol = device['Protocol']
-            username = device['Username']
-            password = device['Password']
             enable = device['Enable']
-            try:
-                proxy = device['Proxy Session']
-            except KeyError:
-                proxy = None
 
-            if not proxy and use_proxy:
-                proxy = default_proxy_session
+            if not session:
+                with open(failed_log, 'a') as logfile:
+                    logfile.write("<M_SCRIPT> Connect to {0} failed.\n".format(hostname))
+                continue
 
-            logger.debug("<M_SCRIPT> Connecting to {0}.".format(hostname))
+            logger.debug("<M_SCRIPT> Connected to %s.", hostname)
             try:
-                script.connect(hostname, username, password, protocol=protocol, proxy=proxy)
-                session = script.get_main_session()
                 hostname, matched_macs = per_device_work(session, enable, vlan_set)
-                script.disconnect()
                 if matched_macs:
                     output_file.write("### Device: {0} ###\n".format(hostname))
                     output_file.write("VLAN    MAC                  PORT\n")
@@ -108,22 +103,15 @@ def script_main(script):
                         output_file.write("{}\n".format(output_line))
                     output_file.write("\n\n")
                     output_file.flush()
-            except scripts.ConnectError as e:
-                with open(failed_log, 'a') as logfile:
-                    logfile.write("<M_SCRIPT> Connect to {0} failed: {1}\n".format(hostname, e.message.strip()))
-                    session.disconnect()
             except sessions.InteractionError as e:
                 with open(failed_log, 'a') as logfile:
                     logfile.write("<M_SCRIPT> Failure on {0}: {1}\n".format(hostname, e.message.strip()))
-                    session.disconnect()
             except sessions.UnsupportedOSError as e:
                 with open(failed_log, 'a') as logfile:
                     logfile.write("<M_SCRIPT> Unsupported OS on {0}: {1}\n".format(hostname, e.message.strip()))
-                    session.disconnect()
             except Exception as e:
                 with open(failed_log, 'a') as logfile:
                     logfile.write("<M_SCRIPT> Exception on {0}: {1} ({2})\n".format(hostname, e.message.strip(), e))
-                    session.disconnect()
 
     # #########################################  END DEVICE CONNECT LOOP  ############################################
 
@@ -174,7 +162,7 @@ def per_device_work(session, enable_pass, vlan_set):
     # that expects "show mac-address-table" instead of "show mac address-table".
     if session.os == "IOS" and len(fsm_results) == 1:
         send_cmd = "show mac-address-table dynamic"
-        logger.debug("Retrying with command set to '{0}'".format(send_cmd))
+        logger.debug("Retrying with command set to '%s'", send_cmd)
         raw_mac = session.get_command_output(send_cmd)
         fsm_results = utilities.textfsm_parse_to_list(raw_mac, template_file, add_header=False)
 
@@ -209,10 +197,14 @@ def per_device_work(session, enable_pass, vlan_set):
 if __name__ == "__builtin__":
     # Initialize script object
     crt_script = scripts.CRTScript(crt)
-    # Run script's main logic against the script object
-    script_main(crt_script)
-    # Shutdown logging after
-    logging.shutdown()
+    try:
+        # Run script's main logic against the script object
+        script_main(crt_script)
+    finally:
+        # Disconnect any connections that were kept open for reuse, even if the script failed
+        crt_script.close_connection_pool()
+        # Shutdown logging after
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
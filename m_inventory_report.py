@@ -23,7 +23,7 @@ from securecrt_tools.message_box_const import *
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ##################################################
@@ -37,18 +37,18 @@ def get_manufacture_date(serial):
 
     :return: The month and year the device was manufactured in string format. (e.g. "September 2010")
     """
-    logger.debug("Received {0} as input".format(serial))
+    logger.debug("Received %s as input", serial)
     if len(serial) == 11:
         try:
             year = str(1996 + int(serial[3:5]))
             week = int(serial[5:7])
         except ValueError:
-            logger.debug("Could not convert {0} or {1} to an int".format(serial[3:5], serial[5:7]))
+            logger.debug("Could not convert %s or %s to an int", serial[3:5], serial[5:7])
             return ""
         date_of_serial = datetime.strptime('{} {} 1'.format(year, week), '%Y %W %w')
         return date_of_serial.strftime('%B %Y')
     else:
-        logger.debug("Received serial {0} is not the correct length".format(serial))
+        logger.debug("Received serial %s is not the correct length", serial)
         return ""
 
 
@@ -91,42 +91,30 @@ def script_main(script):
     failed_log = session.create_output_filename("{0}-LOG".format(script_name.split(".")[0]), include_hostname=False)
 
     device_data = []
-    for device in device_list:
+    # Each device is connected in its own tab, which is disconnected and closed when the loop moves on to the next
+    # device.  Devices without a 'Proxy Session' of their own use the default proxy, if one is set.
+    default_proxy = default_proxy_session if use_proxy else None
+    for device, session in script.ssh_in_new_tabs(device_list, proxy=default_proxy):
         hostname = device['Hostname']
-        protocol = device['Protocol']
-        username = device['Username']
-        password = device['Password']
         enable = device['Enable']
-        try:
-            proxy = device['Proxy Session']
-        except KeyError:
-            proxy = None
 
-        if not proxy and use_proxy:
-            proxy = default_proxy_session
+        if not session:
+            with open(failed_log, 'a') as logfile:
+                logfile.write("<M_SCRIPT> Connect to {0} failed.\n".format(hostname))
+            continue
 
-        logger.debug("<M_SCRIPT> Connecting to {0}.".format(hostname))
+        logger.debug("<M_SCRIPT> Connected to %s.", hostname)
         try:
-            script.connect(hostname, username, password, protocol=protocol, proxy=proxy)
-            session = script.get_main_session()
             device_data.extend(per_device_work(session, enable))
-            script.disconnect()
-        except scripts.ConnectError as e:
-            with open(failed_log, 'a') as logfile:
-                logfile.write("<M_SCRIPT> Connect to {0} failed: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.InteractionError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Failure on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.UnsupportedOSError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Unsupported OS on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except Exception as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Exception on {0}: {1} ({2})\n".format(hostname, e.message.strip(), e))
-                session.disconnect()
 
     # #########################################  END DEVICE CONNECT LOOP  ############################################
 
@@ -183,9 +171,9 @@ def per_device_work(session, enable_pass):
         inv_info = utilities.textfsm_parse_to_dict(raw_inv, inv_template_file)
         for entry in inv_info:
             if entry['NAME'] == "Chassis":
-                logger.debug("<M_SCRIPT> Adding {0} as model number".format(entry['PID']))
+                logger.debug("<M_SCRIPT> Adding %s as model number", entry['PID'])
                 ver_info['MODEL'] = entry['PID']
-                logger.debug("<M_SCRIPT> Adding {0} as serial number".format(entry['SN']))
+                logger.debug("<M_SCRIPT> Adding %s as serial number", entry['SN'])
                 ver_info['SERIAL'] = entry['SN']
                 break
     elif session.os == 'ASA':
@@ -195,7 +183,7 @@ def per_device_work(session, enable_pass):
         # If we don't have a model number in older 'show ver' extract it from the hardware column.
         if not ver_info['MODEL']:
             model = ver_info['HARDWARE'].split(',')[0]
-            logger.debug("<M_SCRIPT> ASA device without model, using {0}".format(model))
+            logger.debug("<M_SCRIPT> ASA device without model, using %s", model)
             ver_info['MODEL'] = model
     elif session.os == 'IOS':
         # Expand multiple serial numbers found in stacks, or just remove lists for serial and model if only 1 device
@@ -217,7 +205,7 @@ def per_device_work(session, enable_pass):
             stack_subset['SERIAL'] = ver_info['SERIAL'][x]
             stack_subset['MODEL'] = ver_info['MODEL'][x]
             new_output.append(stack_subset)
-            logger.debug("Created an entry for {0}/{1}".format(stack_subset['MODEL'], stack_subset['SERIAL']))
+            logger.debug("Created an entry for %s/%s", stack_subset['MODEL'], stack_subset['SERIAL'])
         fsm_output = new_output
 
     # Create output data structure with only the keys that we need.
@@ -241,10 +229,14 @@ def per_device_work(session, enable_pass):
 if __name__ == "__builtin__":
     # Initialize script object
     crt_script = scripts.CRTScript(crt)
-    # Run script's main logic against the script object
-    script_main(crt_script)
-    # Shutdown logging after
-    logging.shutdown()
+    try:
+        # Run script's main logic against the script object
+        script_main(crt_script)
+    finally:
+        # Disconnect any connections that were kept open for reuse, even if the script failed
+        crt_script.close_connection_pool()
+        # Shutdown logging after
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -22,7 +22,7 @@ from securecrt_tools.message_box_const import *
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ##################################################
@@ -72,7 +72,7 @@ def script_main(script):
     selected_vrf = script.prompt_window("Enter the VRF name.\n(Leave blank for default VRF)")
     if selected_vrf == "":
         selected_vrf = None
-    logger.debug("Set VRF to '{0}'".format(selected_vrf))
+    logger.debug("Set VRF to '%s'", selected_vrf)
 
     # Check settings if we should use a proxy/jumpbox
     use_proxy = script.settings.getboolean("Global", "use_proxy")
@@ -85,42 +85,30 @@ def script_main(script):
 
     arp_collection = []
 
-    for device in device_list:
+    # Each device is connected in its own tab, which is disconnected and closed when the loop moves on to the next
+    # device.  Devices without a 'Proxy Session' of their own use the default proxy, if one is set.
+    default_proxy = default_proxy_session if use_proxy else None
+    for device, session in script.ssh_in_new_tabs(device_list, proxy=default_proxy):
         hostname = device['Hostname']
-        protocol = device['Protocol']
-        username = device['Username']
-        password = device['Password']
         enable = device['Enable']
-        try:
-            proxy = device['Proxy Session']
-        except KeyError:
-            proxy = None
 
-        if not proxy and use_proxy:
-            proxy = default_proxy_session
+        if not session:
+            with open(failed_log, 'a') as logfile:
+                logfile.write("<M_SCRIPT> Connect to {0} failed.\n".format(hostname))
+            continue
 
-        logger.debug("<M_SCRIPT> Connecting to {0}.".format(hostname))
+        logger.debug("<M_SCRIPT> Connected to %s.", hostname)
         try:
-            script.connect(hostname, username, password, protocol=protocol, proxy=proxy)
-            session = script.get_main_session()
             arp_collection.extend(per_device_work(session, selected_vrf, add_header=False))
-            script.disconnect()
-        except scripts.ConnectError as e:
-            with open(failed_log, 'a') as logfile:
-                logfile.write("<M_SCRIPT> Connect to {0} failed: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.InteractionError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Failure on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except sessions.UnsupportedOSError as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Unsupported OS on {0}: {1}\n".format(hostname, e.message.strip()))
-                session.disconnect()
         except Exception as e:
             with open(failed_log, 'a') as logfile:
                 logfile.write("<M_SCRIPT> Exception on {0}: {1} ({2})\n".format(hostname, e.message.strip(), e))
-                session.disconnect()
 
     # #########################################  END DEVICE CONNECT LOOP  ############################################
 
@@ -166,13 +154,13 @@ def per_device_work(session, selected_vrf, add_header):
     if selected_vrf:
         send_cmd = send_cmd + " vrf {0}".format(selected_vrf)
         script.hostname = script.hostname + "-VRF-{0}".format(selected_vrf)
-        logger.debug("Updated hostname to: '{0}'".format(script.hostname))
+        logger.debug("Updated hostname to: '%s'", script.hostname)
 
     # Get "show ip arp" data
     raw_arp = session.get_command_output(send_cmd)
 
     # Process with TextFSM
-    logger.debug("Using template: '{0}'".format(template_file))
+    logger.debug("Using template: '%s'", template_file)
     fsm_results = utilities.textfsm_parse_to_list(raw_arp, template_file, add_header=add_header)
 
     # Return terminal parameters to starting values
@@ -187,10 +175,14 @@ def per_device_work(session, selected_vrf, add_header):
 if __name__ == "__builtin__":
     # Initialize script object
     crt_script = scripts.CRTScript(crt)
-    # Run script's main logic against the script object
-    script_main(crt_script)
-    # Shutdown logging after
-    logging.shutdown()
+    try:
+        # Run script's main logic against the script object
+        script_main(crt_script)
+    finally:
+        # Disconnect any connections that were kept open for reuse, even if the script failed
+        crt_script.close_connection_pool()
+        # Shutdown logging after
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -20,7 +20,7 @@ from securecrt_tools import utilities
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -92,8 +92,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
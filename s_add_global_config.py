@@ -22,7 +22,7 @@ from securecrt_tools.message_box_const import *
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -129,11 +129,11 @@ def script_main(session):
     session.start_cisco_session()
 
     commands_to_add = script.settings.getlist(settings_header, session.os)
-    logger.debug("<ADD_GLOBAL_CONFIG> Commands to send:\n{}".format(str(commands_to_add)))
+    logger.debug("<ADD_GLOBAL_CONFIG> Commands to send:\n%s", commands_to_add)
     if commands_to_add:
         add_commands(session, check_mode, commands_to_add)
     else:
-        logger.debug("<ADD_GLOBAL_CONFIG> No commands to send to {}, skipping device.\n".format(session.hostname))
+        logger.debug("<ADD_GLOBAL_CONFIG> No commands to send to %s, skipping device.\n", session.hostname)
         script.message_box("There are no commands for OS type: {}".format(session.os), "No Commands", ICON_STOP)
 
     # Return terminal parameters back to the original state.
@@ -154,8 +154,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -19,7 +19,7 @@ from securecrt_tools import utilities
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -52,7 +52,7 @@ def script_main(session):
     selected_vrf = script.prompt_window("Enter the VRF name.\n(Leave blank for default VRF)")
     if selected_vrf == "":
         selected_vrf = None
-    logger.debug("Set VRF to '{0}'".format(selected_vrf))
+    logger.debug("Set VRF to '%s'", selected_vrf)
 
     # Select template file based on network OS
     if session.os == "IOS":
@@ -62,19 +62,19 @@ def script_main(session):
         send_cmd = "show ip arp detail"
         template_file = script.get_template("cisco_nxos_show_ip_arp_detail.template")
 
-    logger.debug("Command set to '{0}'".format(send_cmd))
+    logger.debug("Command set to '%s'", send_cmd)
 
     # If a VRF was specified, update the commands and outputs to reflect this.
     if selected_vrf:
         send_cmd = send_cmd + " vrf {0}".format(selected_vrf)
         session.hostname = session.hostname + "-VRF-{0}".format(selected_vrf)
-        logger.debug("Updated hostname to: '{0}'".format(session.hostname))
+        logger.debug("Updated hostname to: '%s'", session.hostname)
 
     # Get "show ip arp" data
     raw_arp = session.get_command_output(send_cmd)
 
     # Process with TextFSM
-    logger.debug("Using template: '{0}'".format(template_file))
+    logger.debug("Using template: '%s'", template_file)
     fsm_results = utilities.textfsm_parse_to_list(raw_arp, template_file, add_header=True)
 
     # Generate filename and output data as CSV
@@ -99,8 +99,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
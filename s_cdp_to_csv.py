@@ -19,7 +19,7 @@ from securecrt_tools import utilities
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -53,7 +53,7 @@ def script_main(session):
 
     # Define the command to send to the remote device
     send_cmd = "show cdp neighbors detail"
-    logger.debug("Command set to '{0}'".format(send_cmd))
+    logger.debug("Command set to '%s'", send_cmd)
 
     # Get domain names to strip from device IDs from settings file
     strip_list = script.settings.getlist("cdp_to_csv", "strip_domains")
@@ -96,8 +96,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -22,7 +22,7 @@ from securecrt_tools.message_box_const import *
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -84,12 +84,14 @@ def script_main(session):
     # Get the destination directory from settings
     dest_folder = script.settings.get("create_sessions_from_cdp", "folder")
 
+    new_sessions = []
     for device in session_list:
         system_name = device[0]
         mgmt_ip = device[1]
-        script.create_new_saved_session(system_name, mgmt_ip, folder=dest_folder)
+        new_sessions.append((system_name, mgmt_ip, "SSH2", dest_folder))
         # Track the names of the hosts we've made already
-        logger.debug("Created session for {0}.".format(system_name))
+        logger.debug("Creating session for %s.", system_name)
+    script.create_new_saved_sessions(new_sessions)
 
     # Calculate statistics
     num_created = len(session_list)
@@ -138,7 +140,7 @@ def create_session_list(cdp_list):
                 system_name = device[1]
 
             if system_name in created:
-                logger.debug("Skipping {0} because it is a duplicate.".format(system_name))
+                logger.debug("Skipping %s because it is a duplicate.", system_name)
                 # Go directly to the next device (skip this one)
                 continue
 
@@ -146,22 +148,22 @@ def create_session_list(cdp_list):
             if not mgmt_ip:
                 if not device[4]:
                     # If no mgmt IP or interface IP, skip device.
-                    logger.debug("Skipping {0} because cannot find IP in CDP data.".format(system_name))
+                    logger.debug("Skipping %s because cannot find IP in CDP data.", system_name)
                     # Go directly to the next device (skip this one)
                     continue
                 else:
                     mgmt_ip = device[4][0]
-                    logger.debug("Using interface IP ({0}) for {1}.".format(mgmt_ip, system_name))
+                    logger.debug("Using interface IP (%s) for %s.", mgmt_ip, system_name)
             else:
-                logger.debug("Using management IP ({0}) for {1}.".format(mgmt_ip, system_name))
+                logger.debug("Using management IP (%s) for %s.", mgmt_ip, system_name)
 
             # Add device to session_list
             session_list.append((system_name, mgmt_ip,))
             # Create a new session from the default information.
             created.add(system_name)
         else:
-            logger.debug("Skipping {0} because capabilties are {1}, which does not contain any of {2}."
-                         .format(device[1], capabilities, accepted_capabilities))
+            logger.debug("Skipping %s because capabilties are %s, which does not contain any of %s.",
+                         device[1], capabilities, accepted_capabilities)
 
     return session_list
 
@@ -180,8 +182,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
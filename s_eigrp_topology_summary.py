@@ -19,7 +19,7 @@ from securecrt_tools import utilities
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -56,10 +56,10 @@ def script_main(session, ask_vrf=True, vrf=None):
     if ask_vrf:
         selected_vrf = script.prompt_window("Enter the VRF name. (Leave blank for default VRF, 'all' for all VRFs)")
         selected_vrf = selected_vrf.strip()
-        logger.debug("Input VRF: {0}".format(selected_vrf))
+        logger.debug("Input VRF: %s", selected_vrf)
     else:
         selected_vrf = vrf
-        logger.debug("Received VRF: {0}".format(selected_vrf))
+        logger.debug("Received VRF: %s", selected_vrf)
 
     # If we have a VRF, modify our commands and hostname to reflect it.  If not, pull the default route table.
     if selected_vrf:
@@ -76,7 +76,7 @@ def script_main(session, ask_vrf=True, vrf=None):
     else:
         send_cmd = "show ip eigrp topology"
 
-    logger.debug("Generated Command: {0}".format(send_cmd))
+    logger.debug("Generated Command: %s", send_cmd)
 
     raw_topo = session.get_command_output(send_cmd)
 
@@ -159,8 +159,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -19,7 +19,7 @@ from securecrt_tools import utilities
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -59,7 +59,7 @@ def script_main(session):
     # that expects "show mac-address-table" instead of "show mac address-table".
     if session.os == "IOS" and len(fsm_results) == 1:
         send_cmd = "show mac-address-table dynamic"
-        logger.debug("Retrying with command set to '{0}'".format(send_cmd))
+        logger.debug("Retrying with command set to '%s'", send_cmd)
         raw_mac = session.get_command_output(send_cmd)
         fsm_results = utilities.textfsm_parse_to_list(raw_mac, template_file, add_header=True)
 
@@ -84,8 +84,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
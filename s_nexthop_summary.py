@@ -20,7 +20,7 @@ from securecrt_tools import ipaddress
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -63,7 +63,7 @@ def script_main(session, ask_vrf=True, vrf=None):
     if selected_vrf:
         send_cmd = "show ip route vrf {0}".format(selected_vrf)
         session.hostname = session.hostname + "-VRF-{0}".format(selected_vrf)
-        logger.debug("Received VRF: {0}".format(selected_vrf))
+        logger.debug("Received VRF: %s", selected_vrf)
     else:
         send_cmd = "show ip route"
 
@@ -158,7 +158,7 @@ def parse_routes(fsm_routes):
     for route in fsm_routes:
         new_entry = {}
 
-        logger.debug("Processing route entry: {0}".format(str(route)))
+        logger.debug("Processing route entry: %s", route)
         new_entry['network'] = ipaddress.ip_network(u"{0}/{1}".format(route['NETWORK'], route['MASK']))
 
         new_entry['protocol'] = utilities.normalize_protocol(route['PROTOCOL'])
@@ -180,8 +180,7 @@ def parse_routes(fsm_routes):
             else:
                 new_entry['vrf'] = route['NEXTHOP_VRF']
 
-        logger.debug("Adding updated route entry '{0}' based on the information: {1}".format(str(new_entry),
-                                                                                             str(route)))
+        logger.debug("Adding updated route entry '%s' based on the information: %s", new_entry, route)
         complete_table.append(new_entry)
 
     update_empty_interfaces(complete_table)
@@ -209,7 +208,7 @@ def nexthop_summary(textfsm_dict):
     proto_list = []
     for entry in textfsm_dict:
         if entry['protocol'] not in proto_list and entry['protocol'] not in local_protos:
-            logger.debug("Found protocol '{0}' in the table".format(entry['protocol']))
+            logger.debug("Found protocol '%s' in the table", entry['protocol'])
             proto_list.append(entry['protocol'])
     proto_list.sort(key=utilities.human_sort_key)
     proto_list.insert(0, 'total')
@@ -222,7 +221,7 @@ def nexthop_summary(textfsm_dict):
 
     # Process the route table to populate the above 3 dictionaries.
     for entry in textfsm_dict:
-        logger.debug("Processing route: {0}".format(str(entry)))
+        logger.debug("Processing route: %s", entry)
         # If the route is connected, local or an FHRP entry
         if entry['protocol'] in local_protos:
             if entry['protocol'] == 'connected':
@@ -308,8 +307,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
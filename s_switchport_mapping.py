@@ -35,7 +35,7 @@ except ImportError:
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -213,7 +213,7 @@ def get_mac_table(session):
     # that expects "show mac-address-table" instead of "show mac address-table".
     if session.os == "IOS" and len(mac_table) == 1:
         send_cmd = "show mac-address-table dynamic"
-        logger.debug("Retrying with command set to '{0}'".format(send_cmd))
+        logger.debug("Retrying with command set to '%s'", send_cmd)
 
         raw_mac = session.get_command_output(send_cmd)
 
@@ -300,32 +300,31 @@ def get_arp_info(script):
     if arp_filename == "":
         return {}
 
-    with open(arp_filename, 'r') as arp_file:
-        arp_csv = csv.reader(arp_file)
-        arp_list = [x for x in arp_csv]
-
     arp_lookup = {}
-    # Process all ARP entries AFTER the header row.
-    for entry in arp_list[1:]:
-        # Get the IP address
-        ip = entry[0]
-        # Get the MAC address.  If 'Incomplete', skip entry
-        mac = entry[2]
-        if mac.lower() == 'incomplete':
-            continue
-        # Get the VLAN, if SVI is specified.
-        intf = utilities.long_int_name(entry[3])
-        if intf.lower().startswith('vlan'):
-            vlan = intf[4:]
-        else:
-            vlan = None
+    with open(arp_filename, 'rb') as arp_file:
+        arp_csv = csv.reader(arp_file)
+        # Skip the header row, then process the ARP entries as they are read.
+        next(arp_csv, None)
+        for entry in arp_csv:
+            # Get the IP address
+            ip = entry[0]
+            # Get the MAC address.  If 'Incomplete', skip entry
+            mac = entry[2]
+            if mac.lower() == 'incomplete':
+                continue
+            # Get the VLAN, if SVI is specified.
+            intf = utilities.long_int_name(entry[3])
+            if intf.lower().startswith('vlan'):
+                vlan = intf[4:]
+            else:
+                vlan = None
 
-        if intf in arp_lookup.keys():
-            arp_lookup[intf].append((mac, ip))
-        else:
-            arp_lookup[intf] = [(mac, ip)]
+            if intf in arp_lookup:
+                arp_lookup[intf].append((mac, ip))
+            else:
+                arp_lookup[intf] = [(mac, ip)]
 
-        arp_lookup[(mac, vlan)] = ip
+            arp_lookup[(mac, vlan)] = ip
 
     return arp_lookup
 
@@ -357,8 +356,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -22,7 +22,7 @@ from securecrt_tools.message_box_const import *
 
 # Create global logger so we can write debug messages from any function (if debug mode setting is enabled in settings).
 logger = logging.getLogger("securecrt")
-logger.debug("Starting execution of {0}".format(script_name))
+logger.debug("Starting execution of %s", script_name)
 
 
 # ################################################   SCRIPT LOGIC   ###################################################
@@ -37,8 +37,8 @@ def update_helpers(session, check_mode, old_helpers, new_helpers, remove_old_hel
     unrecognized_helpers = [["Hostname", "Interface", "Helper IP"]]
 
     if session.os not in supported_os:
-        logger.debug("<UPDATE_HELPER> OS is {0}, which is not in supported OS list of {1}"
-                     .format(session.os, supported_os))
+        logger.debug("<UPDATE_HELPER> OS is %s, which is not in supported OS list of %s",
+                     session.os, supported_os)
         raise sessions.UnsupportedOSError("This device's OS is {0}, which is not a supported OS for this script which "
                                           "only supports: {1}).".format(session.os, supported_os))
 
@@ -75,9 +75,9 @@ def update_helpers(session, check_mode, old_helpers, new_helpers, remove_old_hel
         if helper not in old_helpers and helper not in new_helpers:
             unknown_line = [session.hostname, interface, helper, vrf]
             unrecognized_helpers.append(unknown_line)
-            logger.debug("<UPDATE_HELPER> Adding {} to unknown helpers".format(str(unknown_line)))
+            logger.debug("<UPDATE_HELPER> Adding %s to unknown helpers", unknown_line)
 
-    logger.debug("<UPDATE_HELPER> Interfaces with helpers:\n{}".format(str(intfs_with_helpers)))
+    logger.debug("<UPDATE_HELPER> Interfaces with helpers:\n%s", intfs_with_helpers)
 
     # Figure out which interfaces need additional helpers
     need_to_update = []
@@ -92,7 +92,7 @@ def update_helpers(session, check_mode, old_helpers, new_helpers, remove_old_hel
             else:
                 need_to_update.append((interface, vrf, needed_new_helpers, {}))
 
-    logger.debug("<UPDATE_HELPER> Required Updates:\n{}".format(str(need_to_update)))
+    logger.debug("<UPDATE_HELPER> Required Updates:\n%s", need_to_update)
 
     # If we have anything we need to update, build out required config commands, depending on device OS.
     update_commands = []
@@ -273,8 +273,9 @@ if __name__ == "__builtin__":
     except Exception:
         crt_session.end_cisco_session()
         raise
-    # Shutdown logging after
-    logging.shutdown()
+    finally:
+        # Shutdown logging after (this also writes out any buffered debug messages if the script failed)
+        logging.shutdown()
 
 # If the script is being run directly, use the simulation class
 elif __name__ == "__main__":
@@ -7,16 +7,248 @@ remote devices.
 
 import os
 import sys
+import errno
+import stat
 import logging
+import logging.handlers
+import atexit
 import datetime
 import csv
-import getpass
+import collections
+from itertools import chain
 from abc import ABCMeta, abstractmethod
 import sessions
 from settings import SettingsImporter
 from message_box_const import *
 
 
+# The time the script was launched.  This is used for the timestamp in any filenames created by the script, so that all
+# files generated by a single run share the same timestamp.
+_LAUNCH_TIME = datetime.datetime.now()
+_launch_timestamps = {}
+
+# Full paths to TextFSM templates that have already been found, keyed by (script directory, template name).
+_template_paths = {}
+
+# Settings files that have already been loaded, keyed by filename.  Each entry is (modification time, settings), so
+# a settings file that has been changed since it was loaded is read again.
+_loaded_settings = {}
+
+# Fully resolved output directories, keyed by (script directory, output_dir setting).
+_output_dirs = {}
+
+# Expanded prompt ending lists, keyed by the tuple of prompt endings they were built from.  The default Cisco endings
+# are included up front, since nearly every connection uses them.
+_expanded_endings = {("#", ">"): ["#", "# ", ">", "> "]}
+
+# Sent after logging in to check that the device is at the prompt.  The test string is erased with backspaces after it
+# is echoed back, so it is never run as a command.
+_PROMPT_TEST_STRING = "!@&^"
+_PROMPT_TEST_SEND = _PROMPT_TEST_STRING + "\b" * len(_PROMPT_TEST_STRING)
+# How many times the test string is sent before giving up, in case a slow banner or MOTD delays the echo.
+_PROMPT_TEST_ATTEMPTS = 3
+
+# The most sessions that are kept connected for reuse when "reuse_connections" is enabled, in each of the pools kept
+# by CRTScript (sessions saved by disconnect() and tabs opened by ssh_in_new_tab()).  When there are more, the least
+# recently used session is disconnected and its tab is closed.
+_MAX_POOLED_TABS = 16
+
+# Used by DebugScript.message_box() to prompt at the console for the same buttons a SecureCRT message box would show.
+# The button layout is the low 4 bits of the message box options (the icon and default button values are all higher).
+_BUTTON_LAYOUT_MASK = 0x0F
+_MESSAGE_BOX_BUTTONS = {BUTTON_OK: ("OK",), BUTTON_CANCEL: ("OK", "Cancel"),
+                        BUTTON_ABORTRETRYIGNORE: ("Abort", "Retry", "Ignore"),
+                        BUTTON_YESNOCANCEL: ("Yes", "No", "Cancel"), BUTTON_YESNO: ("Yes", "No"),
+                        BUTTON_RETRYCANCEL: ("Retry", "Cancel")}
+# The accepted responses and the console prompt for each button layout, built once from the table above.  Responses
+# are matched without regard to case, so they are stored in lowercase.
+_MESSAGE_BOX_CHOICES = dict((layout, frozenset(label.lower() for label in labels))
+                            for layout, labels in _MESSAGE_BOX_BUTTONS.items())
+_MESSAGE_BOX_PROMPTS = dict((layout, "Choose from {0}: ".format(list(labels)))
+                            for layout, labels in _MESSAGE_BOX_BUTTONS.items())
+_MESSAGE_BOX_RESPONSES = {"ok": IDOK, "cancel": IDCANCEL, "yes": IDYES, "no": IDNO, "retry": IDRETRY, "abort": IDABORT,
+                          "ignore": IDIGNORE}
+
+# The handlers that buffer debug messages for each debug log file, so a log file only gets one handler no matter how
+# many Script objects are created.
+_debug_log_handlers = {}
+
+# Columns that must be in the header row of a device list CSV, and the values accepted in its 'Protocol' column.
+_REQUIRED_DEVICE_HEADER = frozenset(('Hostname', 'Protocol', 'Username'))
+_VALID_PROTOCOLS = frozenset(('', 'ssh', 'ssh1', 'ssh2', 'telnet'))
+# Optional device list columns.  Any that are missing from the CSV are still added to every device, with an empty value.
+_OPTIONAL_DEVICE_HEADER = ('Password', 'Enable', 'Proxy Session')
+# Buffer size used when reading a device list CSV file.
+_CSV_BUFFER_SIZE = 1024 * 1024
+
+
+def _get_launch_timestamp(date_format):
+    """
+    Returns the script launch time formatted with the supplied date format.  The result is saved so that the time is
+    only formatted once per date format, no matter how many Script objects are created.
+
+    :param date_format: A strftime format string (from the settings file)
+    :type date_format: str
+
+    :return: The launch time formatted as a string
+    :rtype: str
+    """
+    if date_format not in _launch_timestamps:
+        _launch_timestamps[date_format] = _LAUNCH_TIME.strftime(date_format)
+    return _launch_timestamps[date_format]
+
+
+def _flush_debug_logs():
+    """
+    Writes any buffered debug messages out to their log files.  This is registered once to run when the interpreter
+    exits.  Scripts should also call logging.shutdown() when they finish (even if they fail), which does the same.
+    """
+    for handler in _debug_log_handlers.values():
+        handler.flush()
+
+
+atexit.register(_flush_debug_logs)
+
+
+def _load_settings(settings_file, create=False):
+    """
+    Returns a SettingsImporter for the supplied settings file.  If the file was already loaded by this script and hasn't
+    been modified since, the same SettingsImporter is returned instead of parsing the file again.
+
+    :param settings_file: The full path to the settings.ini file
+    :type settings_file: str
+    :param create: If True, a missing settings file is created from the default settings.
+    :type create: bool
+
+    :return: The settings loaded from the file
+    :rtype: SettingsImporter
+    """
+    try:
+        mtime = os.path.getmtime(settings_file)
+    except OSError:
+        if not create:
+            # Let SettingsImporter raise the usual IOError for a missing file.
+            return SettingsImporter(settings_file)
+        mtime = None
+
+    cached = _loaded_settings.get(settings_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    settings = SettingsImporter(settings_file, create=create)
+    # Loading may have added missing settings to the file, so save it against the time it was last written.
+    _loaded_settings[settings_file] = (os.path.getmtime(settings_file), settings)
+    return settings
+
+
+def _resolve_output_dir(script_dir, output_dir):
+    """
+    Returns the full, real path of the output directory from the settings file.  Environment variables and the home
+    directory are expanded, and relative paths are treated as relative to the script directory.
+
+    :param script_dir: The directory that contains the running script
+    :type script_dir: str
+    :param output_dir: The output_dir value from the settings file
+    :type output_dir: str
+
+    :return: The absolute path to the output directory
+    :rtype: str
+    """
+    key = (script_dir, output_dir)
+    if key not in _output_dirs:
+        # Only expand the path if it contains a home directory or environment variable reference.
+        if '$' in output_dir or '%' in output_dir or '~' in output_dir:
+            exp_output_dir = os.path.expandvars(os.path.expanduser(output_dir))
+        else:
+            exp_output_dir = output_dir
+        if os.path.isabs(exp_output_dir):
+            _output_dirs[key] = os.path.realpath(exp_output_dir)
+        else:
+            _output_dirs[key] = os.path.realpath(os.path.join(script_dir, exp_output_dir))
+    return _output_dirs[key]
+
+
+def _expand_endings(prompt_endings):
+    """
+    Returns the list of prompt endings to watch for, which includes each ending both with and without a trailing space.
+    The list is built once for each set of prompt endings and shared between calls, so it must not be modified.
+
+    :param prompt_endings: A list of strings that are possible prompt endings
+    :type prompt_endings: list
+
+    :return: Each prompt ending, followed by the same ending with a space appended.
+    :rtype: list
+    """
+    key = tuple(prompt_endings)
+    if key not in _expanded_endings:
+        _expanded_endings[key] = list(chain.from_iterable((ending, ending + " ") for ending in key))
+    return _expanded_endings[key]
+
+
+def _ssh_connect_string(version, host, username, password, proxy=None):
+    """
+    Builds the SecureCRT command line arguments used to start an SSH connection.  The username and password are wrapped
+    in double quotes if they contain whitespace, so that they are passed to SecureCRT as a single argument.
+
+    :param version: The SSH version to connect with (1 or 2)
+    :type version: int
+    :param host: The IP address of DNS name for the device to connect
+    :type host: str
+    :param username: The username to login to the device with
+    :type username: str
+    :param password: The password that goes with the provided username
+    :type password: str
+    :param proxy: The name of a SecureCRT session object to proxy the connection through, if any
+    :type proxy: str
+
+    :return: The arguments to pass to ConnectInTab()
+    :rtype: str
+    """
+    parts = ["/SSH{0}".format(version), "/ACCEPTHOSTKEYS", "/L", _quote_argument(username),
+             "/PASSWORD", _quote_argument(password), host]
+    if proxy:
+        parts.insert(0, "/FIREWALL=Session:\"{0}\"".format(proxy))
+    return " ".join(parts)
+
+
+def _quote_argument(value):
+    """
+    Wraps a command line argument in double quotes if it contains whitespace.  A quoted argument can't contain a double
+    quote of its own, because SecureCRT would take it as the end of the argument, so a ConnectError is raised instead.
+
+    :param value: The argument value
+    :type value: str
+
+    :return: The value, quoted if needed
+    :rtype: str
+    """
+    if value and any(char.isspace() for char in value):
+        if "\"" in value:
+            raise ConnectError("Usernames and passwords that contain spaces cannot also contain a double quote (\").")
+        return "\"{0}\"".format(value)
+    return value
+
+
+def _console_input(prompt):
+    """
+    Prints a prompt to the console and returns the line the user enters, without the trailing newline.  This is used by
+    DebugScript in place of raw_input(), which also flushes stderr and checks for an interactive terminal on each call.
+
+    :param prompt: The text to display before reading the input
+    :type prompt: str
+
+    :return: The line entered by the user
+    :rtype: str
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        # Same as raw_input(), so a closed stdin can't leave a caller waiting for a valid answer forever.
+        raise EOFError("No more input available from the console.")
+    return line[:-1] if line.endswith("\n") else line
+
+
 # ################################################    EXCEPTIONS     ###################################################
 
 
@@ -26,11 +258,10 @@ class ScriptError(Exception):
     """
     pass
 
-class ConnectError(Exception):
-    """
-    An exception type that is raised when there are problems connecting to a device.
-    """
-    pass
+
+# ConnectError is defined in the sessions module, because sessions also raise it when they fail to connect or
+# disconnect.  It is available here so scripts can catch scripts.ConnectError.
+ConnectError = sessions.ConnectError
 
 
 # ################################################    APP  CLASSES    ##################################################
@@ -73,56 +304,90 @@ class Script:
     messages and format the text box that should pop up to the user, but in the DebugScript class this method only
     prints the message to the console.  In this way, a call to this method will work either way the script is called
     as long as the correct Script sub-class is being used (and the template are already written to do this).
+
+    When "debug_mode" is enabled in the settings file, debug messages are written to a file in the "debugs" directory
+    under the output directory.  If logging has been turned off for the whole interpreter (with logging.disable()),
+    debug mode is treated as off and the debug directory and log file are not created, even if "debug_mode" is enabled.
     """
     __metaclass__ = ABCMeta
 
     def __init__(self, script_path):
         # Initialize application attributes
         self.script_dir, self.script_name = os.path.split(script_path)
-        self.logger = logging
+        self.logger = logging.getLogger("securecrt")
         self.main_session = None
         self.host_os = sys.platform
+        # Directories that validate_dir() has already found or created, keyed by normalized path.
+        self._validated_dirs = {}
 
         # Load Settings
         settings_file = os.path.join(self.script_dir, "settings", "settings.ini")
         try:
-            self.settings = SettingsImporter(settings_file)
+            self.settings = _load_settings(settings_file)
         except IOError:
             error_msg = "A settings file at {0} does not exist.  Do you want to create it?".format(settings_file)
             result = self.message_box(error_msg, "Missing Settings File", ICON_QUESTION | BUTTON_YESNO)
             if result == IDYES:
-                self.settings = SettingsImporter(settings_file, create=True)
+                self.settings = _load_settings(settings_file, create=True)
             else:
                 raise ScriptError("Settings file not found")
 
-        # Get the date and time, which is returned when creating filenames based on a session from this script.
-        now = datetime.datetime.now()
-        date_format = self.settings.get("Global", "date_format")
-        self.datetime = now.strftime(date_format)
+        # The formatted launch time is looked up the first time it is needed (see the datetime property).
+        self._datetime = None
 
         # Extract and store "save path" for future reference by scripts.
         output_dir = self.settings.get("Global", "output_dir")
-        exp_output_dir = os.path.expandvars(os.path.expanduser(output_dir))
-        if os.path.isabs(exp_output_dir):
-            self.output_dir = os.path.realpath(exp_output_dir)
-        else:
-            full_path = os.path.join(self.script_dir, exp_output_dir)
-            self.output_dir = os.path.realpath(full_path)
+        self.output_dir = _resolve_output_dir(self.script_dir, output_dir)
         self.validate_dir(self.output_dir)
 
+        # Keep the settings that are checked on every session or command, so the settings file isn't re-parsed.
+        self.debug_mode, self.modify_term, self.bulk_capture = \
+            self.settings.getbooleans("Global", "debug_mode", "modify_term", "bulk_capture")
+
+        # If logging is disabled globally, debug messages would be dropped anyway, so treat debug mode as off.  This
+        # skips creating the debug directory and log file, and saving debug copies of command output.
+        if logging.root.manager.disable >= logging.DEBUG:
+            self.debug_mode = False
+
         # Check if Debug Mode is enabled.
-        if self.settings.getboolean("Global", "debug_mode"):
+        if self.debug_mode:
             self.debug_dir = os.path.join(self.output_dir, "debugs")
             self.validate_dir(self.debug_dir)
-            log_file = os.path.join(self.debug_dir, self.script_name.replace(".py", "-debug.txt"))
-            self.logger = logging.getLogger("securecrt")
+            log_file = os.path.join(self.debug_dir, os.path.splitext(self.script_name)[0] + "-debug.txt")
             self.logger.propagate = False
             self.logger.setLevel(logging.DEBUG)
-            formatter = logging.Formatter('%(asctime)s - %(message)s', datefmt='%m/%d/%Y %I:%M:%S')
-            fh = logging.FileHandler(log_file, mode='w')
-            fh.setFormatter(formatter)
-            self.logger.addHandler(fh)
-            self.logger.debug("<SCRIPT_INIT> Starting Logging. Running Python version: {0}".format(sys.version))
+            memory_handler = _debug_log_handlers.get(log_file)
+            # A handler that was closed by logging.shutdown() has no target, so it is replaced.
+            if not memory_handler or not memory_handler.target:
+                if memory_handler:
+                    self.logger.removeHandler(memory_handler)
+                formatter = logging.Formatter('%(asctime)s - %(message)s', datefmt='%m/%d/%Y %I:%M:%S')
+                # The log file isn't opened (and truncated) until the first batch of messages is written to it.
+                fh = logging.FileHandler(log_file, mode='w', delay=True)
+                fh.setFormatter(formatter)
+                # Collect debug messages and write them to the file in batches.  Warnings and errors are written
+                # immediately (with everything before them), and anything left is written when logging is shut down
+                # or the interpreter exits.
+                memory_handler = logging.handlers.MemoryHandler(100, flushLevel=logging.WARNING, target=fh)
+                _debug_log_handlers[log_file] = memory_handler
+                self.logger.addHandler(memory_handler)
+            self.logger.debug("<SCRIPT_INIT> Starting Logging. Running Python version: %s", sys.version)
+        else:
+            # Debug messages are discarded with a simple level check on the logger.
+            self.logger.setLevel(logging.WARNING)
+
+    @property
+    def datetime(self):
+        """
+        The date and time the script was launched, formatted with the date_format setting.  This is used when creating
+        filenames based on a session from this script, and is only formatted if a script actually needs it.
+
+        :return: The formatted launch time
+        :rtype: str
+        """
+        if self._datetime is None:
+            self._datetime = _get_launch_timestamp(self.settings.get("Global", "date_format"))
+        return self._datetime
 
     def get_main_session(self):
         """
@@ -144,23 +409,40 @@ class Script:
         :type path: str
         """
 
-        self.logger.debug("<VALIDATE_PATH> Starting validation of path: {0}".format(path))
+        key = os.path.normpath(path)
+        if key in self._validated_dirs:
+            return
+
+        self.logger.debug("<VALIDATE_PATH> Starting validation of path: %s", path)
 
         # Verify that base_path is valid absolute path, or else error and exit.
         if not os.path.isabs(path):
-            self.logger.debug("<VALIDATE_PATH> Supplied path is not an absolute path. Raising exception".format(path))
+            self.logger.debug("<VALIDATE_PATH> Supplied path is not an absolute path. Raising exception")
             error_str = 'Directory {0} is invalid.'.format(path)
             raise IOError(error_str)
 
-        # Check if directory exists.  If not, prompt to create it.
-        if not os.path.exists(os.path.normpath(path)):
+        # Check if directory exists with a single stat call.  If not, prompt to create it.
+        try:
+            path_exists = True
+            path_is_dir = stat.S_ISDIR(os.stat(path).st_mode)
+        except OSError as err:
+            if err.errno != errno.ENOENT:
+                raise
+            path_exists = False
+
+        if path_exists and not path_is_dir:
+            self.logger.debug("<VALIDATE_PATH> Supplied path exists but is not a directory. Raising exception")
+            error_str = 'Directory {0} is invalid.'.format(path)
+            raise IOError(error_str)
+
+        if not path_exists:
             if prompt_to_create:
                 self.logger.debug("<VALIDATE_PATH> Supplied directory path does not exist. Prompting User.")
                 message_str = "The path: '{0}' does not exist.  Do you want to create it?.".format(path)
                 result = self.message_box(message_str, "Create Directory?", ICON_QUESTION | BUTTON_YESNO | DEFBUTTON2)
 
                 if result == IDYES:
-                    self.logger.debug("<VALIDATE_PATH> User chose to create directory.".format(path))
+                    self.logger.debug("<VALIDATE_PATH> User chose to create directory.")
                     os.makedirs(path)
                 else:
                     self.logger.debug("<VALIDATE_PATH> User chose NOT to create directory.  Raising exception")
@@ -168,10 +450,11 @@ class Script:
                     raise IOError(error_str)
             else:
                 self.logger.debug("<VALIDATE_PATH> Supplied directory path does not exist. Prompting User OVERRIDDEN")
-                self.logger.debug("<VALIDATE_PATH> Creating directory.".format(path))
+                self.logger.debug("<VALIDATE_PATH> Creating directory.")
                 os.makedirs(path)
 
         self.logger.debug("<VALIDATE_PATH> Path is Valid.")
+        self._validated_dirs[key] = True
 
     def get_template(self, name):
         """
@@ -183,8 +466,13 @@ class Script:
         :return: Full path to the template location
         :rtype: str
         """
+        key = (self.script_dir, name)
+        if key in _template_paths:
+            return _template_paths[key]
+
         path = os.path.abspath(os.path.join(self.script_dir, "textfsm-templates", name))
         if os.path.isfile(path):
+            _template_paths[key] = path
             return path
         else:
             raise IOError("The template name {0} does not exist.".format(name))
@@ -230,72 +518,86 @@ class Script:
         default_enable = None
         prompt_enable = True
         credentials = {}
-        required_header = {'Hostname', 'Protocol', 'Username'}
+        # Usernames the user didn't give a password for, so rows with those usernames are skipped without re-prompting.
+        no_password = set()
+        # Check the log level once instead of building debug records for every row of a large CSV file.
+        log_rows = self.logger.isEnabledFor(logging.DEBUG)
 
         # Extract the list of devices into a data structure we can use (and fill in any gaps needed).
-        with open(device_list_filename, 'r') as device_file:
-            device_csv = csv.DictReader(device_file)
+        # The csv module expects files opened in binary mode, so it handles the line endings itself.
+        with open(device_list_filename, 'rb', _CSV_BUFFER_SIZE) as device_file:
+            device_csv = csv.DictReader(device_file, restval="")
 
-            # Get a list of all the header values found in the CSV in lowercase.
+            # Get a list of all the header values found in the CSV.  Spaces around the column names (such as
+            # "Hostname, Protocol, Username") are removed once here, rather than cleaning up values on every row.
+            device_csv.fieldnames = [name.strip() for name in device_csv.fieldnames or []]
             header = set(device_csv.fieldnames)
-            if required_header.difference(header):
+            if not _REQUIRED_DEVICE_HEADER.issubset(header):
                 raise ScriptError("CSV file does not have a valid header row.\n"
                                   "Please see the documentation or the templates/sample_device_list.csv file for an "
                                   "example")
+            # Add any missing optional columns to the field names, so the reader fills them in with an empty value as
+            # it builds each row instead of setting them afterwards.
+            device_csv.fieldnames += [field for field in _OPTIONAL_DEVICE_HEADER if field not in header]
 
-            line = 0
-            for entry in device_csv:
-                line += 1
-
+            for line, entry in enumerate(device_csv, 1):
                 if not entry['Hostname']:
-                    self.logger.debug("<IMPORT_DEVICES> Skipping CSV line {0} because no hostname exists.".format(line))
+                    if log_rows:
+                        self.logger.debug("<IMPORT_DEVICES> Skipping CSV line %s because no hostname exists.", line)
                     skipped_lines += 1
                     continue
 
-                if entry['Protocol'].lower() not in ['', 'ssh', 'ssh1', 'ssh2', 'telnet']:
-                    self.logger.debug("<IMPORT_DEVICES> Skipping CSV line {0} because no valid protocol.".format(line))
+                # Store the protocol in lowercase, so it doesn't need to be converted again when connecting.
+                entry['Protocol'] = entry['Protocol'].lower()
+                if entry['Protocol'] not in _VALID_PROTOCOLS:
+                    if log_rows:
+                        self.logger.debug("<IMPORT_DEVICES> Skipping CSV line %s because no valid protocol.", line)
                     skipped_lines += 1
                     continue
 
                 if not entry['Username']:
                     if default_username:
                         entry['Username'] = default_username
-                        self.logger.debug("<IMPORT_DEVICES> Using default username '{0}', for host {1}."
-                                          .format(default_username, entry['Hostname']))
+                        if log_rows:
+                            self.logger.debug("<IMPORT_DEVICES> Using default username '%s', for host %s.",
+                                              default_username, entry['Hostname'])
                     else:
                         self.logger.debug(
-                            "<IMPORT_DEVICES> Didn't find username for host '{0}'.  Prompting for DEFAULT."
-                            .format(entry['Hostname']))
+                            "<IMPORT_DEVICES> Didn't find username for host '%s'.  Prompting for DEFAULT.",
+                            entry['Hostname'])
                         default_username = self.prompt_window("Enter the DEFAULT USERNAME to use.")
                         if not default_username:
-                            self.logger.debug("<IMPORT_DEVICES> Default username not provided.  Stopping".format(line))
+                            self.logger.debug("<IMPORT_DEVICES> Default username not provided.  Stopping")
                             error = "Found hosts without usernames and no default username provided."
                             raise ScriptError(error)
                         else:
-                            self.logger.debug("<IMPORT_DEVICES> Using default username '{0}', for host {1}."
-                                              .format(default_username, entry['Hostname']))
+                            self.logger.debug("<IMPORT_DEVICES> Using default username '%s', for host %s.",
+                                              default_username, entry['Hostname'])
                             entry['Username'] = default_username
 
-                if "Password" not in header:
-                    entry['Password'] = ""
                 if not entry['Password']:
-                    try:
-                        entry['Password'] = credentials[entry['Username']]
-                    except KeyError:
-                        self.logger.debug("<IMPORT_DEVICES> Prompting for password for username '{0}'"
-                                          .format(entry['Username']))
+                    if entry['Username'] in no_password:
+                        if log_rows:
+                            self.logger.debug("<IMPORT_DEVICES> Skipping %s.  No password for user.", entry['Hostname'])
+                        skipped_lines += 1
+                        continue
+                    password = credentials.get(entry['Username'])
+                    if password:
+                        entry['Password'] = password
+                    else:
+                        self.logger.debug("<IMPORT_DEVICES> Prompting for password for username '%s'",
+                                          entry['Username'])
                         password = self.prompt_window("Enter the password for USER: {0}".format(entry['Username']),
                                                       hide_input=True)
                         if password:
                             credentials[entry['Username']] = password
                             entry['Password'] = password
                         else:
-                            self.logger.debug("<IMPORT_DEVICES> Skipping {0}.  No password for user.".format(line[0]))
+                            self.logger.debug("<IMPORT_DEVICES> Skipping %s.  No password for user.", entry['Hostname'])
+                            no_password.add(entry['Username'])
                             skipped_lines += 1
                             continue
 
-                if "Enable" not in header:
-                    entry['Enable'] = ""
                 if not entry["Enable"]:
                     if default_enable:
                         entry["Enable"] = default_enable
@@ -417,6 +719,71 @@ class Script:
         """
         pass
 
+    @abstractmethod
+    def ssh_in_new_tab(self, host, username, password, prompt_endings=("#", ">")):
+        """
+        Opens a new tab and connects to the device via SSH2 in that tab.  The main session of the script is not
+        changed.
+
+        If the "reuse_connections" setting is enabled, the tab is left open and a later call for the same host and
+        username returns the same session (if it is still connected) instead of logging in again.  These tabs are
+        closed by close_connection_pool().
+
+        :param host: The IP address of DNS name for the device to connect
+        :type host: str
+        :param username: The username to login to the device with
+        :type username: str
+        :param password: The password that goes with the provided username.
+        :type password: str
+        :param prompt_endings: A list of strings that are possible prompt endings to watch for.  The default is for
+                               Cisco devices (">" and "#"), but may need to be changed if connecting to another
+                               type of device (for example "$" for some linux hosts).
+        :type prompt_endings: list
+
+        :return: A session object for the new tab
+        :rtype: sessions.Session
+        """
+        pass
+
+    @abstractmethod
+    def ssh_in_new_tabs(self, device_list, max_tabs=8, prompt_endings=("#", ">"), proxy=None):
+        """
+        Connects to each device in a list, each in its own new tab (using the device's 'Protocol' and 'Proxy Session'
+        values), and returns a generator that provides a session for one device at a time.  Connections to the next few
+        devices in the list are started ahead of time so they can log in while the script is working with the current
+        device.  When the script moves on to the next device, the tab for the previous device is disconnected and
+        closed.  Devices are provided in list order, except that a device that has already connected is provided before
+        earlier devices that are still connecting.
+
+        :param device_list: A list of dictionaries with (at least) 'Hostname', 'Username' and 'Password' keys, and
+                            optionally 'Protocol' and 'Proxy Session' keys, such as the list returned by
+                            import_device_list()
+        :type device_list: list of dict
+        :param max_tabs: The maximum number of tabs that are connected (or connecting) at the same time.
+        :type max_tabs: int
+        :param prompt_endings: A list of strings that are possible prompt endings to watch for.  The default is for
+                               Cisco devices (">" and "#"), but may need to be changed if connecting to another
+                               type of device (for example "$" for some linux hosts).
+        :type prompt_endings: list
+        :param proxy: The name of a SecureCRT session object to proxy connections through, for devices that don't have
+                      a 'Proxy Session' of their own.
+        :type proxy: str
+
+        :return: A generator of (device, session) tuples.  The session is None if the connection to the device failed.
+        :rtype: generator
+        """
+        pass
+
+    @abstractmethod
+    def close_connection_pool(self, command="exit"):
+        """
+        Disconnects any sessions that were kept connected for reuse because the "reuse_connections" setting is enabled.
+        This should be called at the end of any script that connects to multiple devices.
+
+        :param command: The command to be issued to the remote devices to disconnect.  The default is 'exit'
+        :type command: str
+        """
+        pass
 
     @abstractmethod
     def message_box(self, message, title="", options=0):
@@ -499,6 +866,18 @@ class Script:
         """
         pass
 
+    @abstractmethod
+    def create_new_saved_sessions(self, session_list):
+        """
+        Creates multiple session objects that can be opened from the Connect menu in SecureCRT.  This is faster than
+        calling create_new_saved_session() for each session when importing many devices.
+
+        :param session_list: A list of (session_name, ip, protocol, folder) tuples, one for each session to create.
+            See create_new_saved_session() for a description of each value.
+        :type session_list: list of tuple
+        """
+        pass
+
 
 class CRTScript(Script):
     """
@@ -516,53 +895,93 @@ class CRTScript(Script):
 
         # Set up SecureCRT tab for interaction with the scripts
         self.main_session = sessions.CRTSession(self, self.crt.GetScriptTab())
-
-    def __post_connect_check(self, endings):
+        self.script_tab_session = self.main_session
+
+        # If enabled in the settings, SSH sessions are kept connected when disconnect() is called so that a later
+        # connection to the same device can reuse the tab instead of logging in again.  They are keyed by
+        # (host, username, version, proxy) in least recently used order.
+        self.reuse_connections = self.settings.getboolean("Global", "reuse_connections")
+        self.connection_pool = collections.OrderedDict()
+        self.connection_key = None
+        # Tabs opened by ssh_in_new_tab() that are kept for reuse, keyed by (host, username) in least recently used
+        # order.
+        self.tab_pool = collections.OrderedDict()
+
+        # The "Default" session configuration used by create_new_saved_sessions() (opened on first use), and the
+        # protocol that was last set on it.
+        self.session_template = None
+        self.session_template_protocol = None
+
+    def __post_connect_check(self, endings, session=None, idle=False):
         """
         Validates that we've gotten to the prompt after a connection is made.
 
         :param endings: A list of strings, where each string is a possible character that would be found at the end
                         of the CLI prompt for the remote device.
         :type endings: list
+        :param session: The session to check.  Default is the main session.
+        :type session: sessions.CRTSession
+        :param idle: Set to True if the session was already logged in and idle, so no banners can be printing.  A
+                     carriage return is sent and the re-printed prompt is accepted without sending a test string.
+        :type idle: bool
         """
-        self.logger.debug("<CONN_CHECK> Started looking for following prompt endings: {0}".format(endings))
-        at_prompt = False
-        while not at_prompt:
-            found = self.main_session.screen.WaitForStrings(endings, self.main_session.response_timeout)
+        self.logger.debug("<CONN_CHECK> Started looking for following prompt endings: %s", endings)
+        if not session:
+            session = self.main_session
+        screen = session.screen
+        timeout = session.response_timeout
+
+        if idle:
+            screen.Send("\r")
+            if screen.WaitForStrings(endings, timeout):
+                self.logger.debug("<CONN_CHECK> Idle session at prompt.  Continuing")
+                return
+            self.logger.debug("<CONN_CHECK> No prompt from idle session.  Sending test string.")
+        else:
+            found = screen.WaitForStrings(endings, timeout)
             if not found:
                 raise sessions.InteractionError("Timeout reached looking for prompt endings: {0}".format(endings))
-            else:
-                test_string = "!@&^"
-                self.main_session.screen.Send(test_string + "\b" * len(test_string))
-                result = self.main_session.screen.WaitForStrings(test_string, self.main_session.response_timeout)
-                if result:
-                    self.logger.debug("<CONN_CHECK> At prompt.  Continuing".format(result))
-                    at_prompt = True
 
-    def __connect_ssh_2(self, host, username, password, proxy=None, prompt_endings=("#", "# ", ">")):
+        # Send a test string that will only be echoed back once we are at the prompt.  Waiting for just the echo skips
+        # over any prompt endings from banners that are still printing.  If a slow banner or MOTD delays the echo past
+        # the timeout, wait for the next prompt ending and send the test string again.  Checking whether the cursor
+        # has stopped moving (WaitForCursor) can't replace this: the screen is Synchronous, so SecureCRT only displays
+        # output as the script reads it, and the cursor looks idle even while banner text is still waiting to be read.
+        for attempt in range(_PROMPT_TEST_ATTEMPTS):
+            if attempt and not screen.WaitForStrings(endings, timeout):
+                raise sessions.InteractionError("Timeout reached looking for prompt endings: {0}".format(endings))
+            screen.Send(_PROMPT_TEST_SEND)
+            if screen.WaitForString(_PROMPT_TEST_STRING, timeout):
+                if attempt:
+                    # The echo that was found may be from an earlier attempt.  Read through to a new prompt, so any
+                    # later echoes aren't left on the screen to be read when the session is used.
+                    screen.Send("\r")
+                    if not screen.WaitForStrings(endings, timeout):
+                        raise sessions.InteractionError(
+                            "Timeout reached looking for prompt endings: {0}".format(endings))
+                self.logger.debug("<CONN_CHECK> At prompt.  Continuing")
+                return
+            self.logger.debug("<CONN_CHECK> Test string not echoed back (attempt %s).", attempt + 1)
+        raise sessions.InteractionError("Timeout reached waiting for the test string '{0}' to be echoed back after {1} "
+                                        "attempts.".format(_PROMPT_TEST_STRING, _PROMPT_TEST_ATTEMPTS))
+
+    def __do_ssh_connect(self, version, host, username, password, proxy=None, prompt_endings=("#", "# ", ">")):
         if not prompt_endings:
             raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
 
-        expanded_endings = []
-        for ending in prompt_endings:
-            expanded_endings.append("{0}".format(ending))
-            expanded_endings.append("{0} ".format(ending))
+        tag = "<CONNECT_SSH{0}>".format(version)
+        expanded_endings = _expand_endings(prompt_endings)
 
-        # If we have a proxy object, verify
-        if proxy:
-            ssh2_string = "/FIREWALL=Session:\"{0}\" /SSH2 /ACCEPTHOSTKEYS  /L {1} /PASSWORD {2} {3}"\
-                .format(proxy, username, password, host)
-        else:
-            ssh2_string = "/SSH2 /ACCEPTHOSTKEYS /L {0} /PASSWORD {1} {2}".format(username, password, host)
+        ssh_string = _ssh_connect_string(version, host, username, password, proxy=proxy)
 
         # If the tab is already connected, then give an exception that we cannot connect.
         if self.main_session.is_connected():
-            self.logger.debug("<CONNECT_SSH2> Session already connected.  Raising exception")
+            self.logger.debug("%s Session already connected.  Raising exception", tag)
             raise ConnectError("Tab is already connected to another device.")
         else:
             try:
-                self.logger.debug("<CONNECT_SSH2> Attempting Connection to: {0}@{1} via SSH2".format(username, host))
-                tab = self.main_session.session.ConnectInTab(ssh2_string)
+                self.logger.debug("%s Attempting Connection to: %s@%s via SSH%s", tag, username, host, version)
+                tab = self.main_session.session.ConnectInTab(ssh_string)
                 tab_index = tab.Index
                 self.main_session = sessions.CRTSession(self, self.crt.GetTab(tab_index), prompt_endings=prompt_endings)
             except:
@@ -573,47 +992,16 @@ class CRTScript(Script):
         # Set Tab parameters to allow correct sending/receiving of data via SecureCRT
         self.main_session.screen.Synchronous = True
         self.main_session.screen.IgnoreEscape = True
-        self.logger.debug("<CONNECT_SSH2> Set Synchronous and IgnoreEscape")
+        self.logger.debug("%s Set Synchronous and IgnoreEscape", tag)
 
         # Make sure banners have printed and we've reached our expected prompt.
         self.__post_connect_check(expanded_endings)
 
-    def __connect_ssh_1(self, host, username, password, proxy=None, prompt_endings=("#", "# ", ">")):
-        if not prompt_endings:
-            raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
-
-        expanded_endings = []
-        for ending in prompt_endings:
-            expanded_endings.append("{0}".format(ending))
-            expanded_endings.append("{0} ".format(ending))
-
-        if proxy:
-            ssh1_string="/FIREWALL=Session:\"{0}\" /SSH1 /ACCEPTHOSTKEYS /L {0} /PASSWORD {1} {2}".format(proxy, username,
-                                                                                                      password, host)
-        else:
-            ssh1_string = "/SSH1 /ACCEPTHOSTKEYS /L {0} /PASSWORD {1} {2}".format(username, password, host)
-
-        # If the tab is already connected, then give an exception that we cannot connect.
-        if self.main_session.is_connected():
-            self.logger.debug("<CONNECT_SSH1> Session already connected.  Raising exception")
-            raise ConnectError("Tab is already connected to another device.")
-        else:
-            try:
-                self.logger.debug("<CONNECT_SSH1> Attempting Connection to: {0}@{1} via SSH1".format(username, host))
-                tab = self.main_session.session.ConnectInTab(ssh1_string)
-                tab_index = tab.Index
-                self.main_session = sessions.CRTSession(self, self.crt.GetTab(tab_index), prompt_endings=prompt_endings)
-            except:
-                error = self.crt.GetLastErrorMessage()
-                raise ConnectError(error)
-
-        # Set Tab parameters to allow correct sending/receiving of data via SecureCRT
-        self.main_session.screen.Synchronous = True
-        self.main_session.screen.IgnoreEscape = True
-        self.logger.debug("<CONNECT_SSH1> Set Synchronous and IgnoreEscape")
+    def __connect_ssh_2(self, host, username, password, proxy=None, prompt_endings=("#", "# ", ">")):
+        self.__do_ssh_connect(2, host, username, password, proxy=proxy, prompt_endings=prompt_endings)
 
-        # Make sure banners have printed and we've reached our expected prompt.
-        self.__post_connect_check(expanded_endings)
+    def __connect_ssh_1(self, host, username, password, proxy=None, prompt_endings=("#", "# ", ">")):
+        self.__do_ssh_connect(1, host, username, password, proxy=proxy, prompt_endings=prompt_endings)
 
     def connect_ssh(self, host, username, password, version=None, proxy=None, prompt_endings=("#", ">")):
         """
@@ -639,11 +1027,32 @@ class CRTScript(Script):
                                type of device (for example "$" for some linux hosts).
         :type prompt_endings: list
         """
-        self.logger.debug("<CONNECT_SSH> Attempting Connection to: {0}@{1}".format(username, host))
+        self.logger.debug("<CONNECT_SSH> Attempting Connection to: %s@%s", username, host)
 
         if not prompt_endings:
             raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
 
+        key = (host, username, version, proxy)
+        # A saved connection can only be used if the script isn't already connected to another device.
+        if self.reuse_connections and key in self.connection_pool and not self.main_session.is_connected():
+            pooled_session = self.connection_pool.pop(key)
+            if pooled_session.is_connected():
+                pooled_session.screen.Synchronous = True
+                pooled_session.screen.IgnoreEscape = True
+                try:
+                    self.__post_connect_check(_expand_endings(prompt_endings), session=pooled_session, idle=True)
+                except sessions.InteractionError:
+                    self.logger.debug("<CONNECT_SSH> Saved connection to %s is not responding.  Reconnecting.", host)
+                    self.__close_tab(pooled_session)
+                else:
+                    self.logger.debug("<CONNECT_SSH> Reusing existing connection to: %s@%s", username, host)
+                    self.main_session = pooled_session
+                    self.connection_key = key
+                    return
+            else:
+                self.logger.debug("<CONNECT_SSH> Saved connection to %s was disconnected.  Reconnecting.", host)
+                self.__close_tab(pooled_session)
+
         if version == 2:
             self.__connect_ssh_2(host, username, password, proxy=proxy, prompt_endings=prompt_endings)
         elif version == 1:
@@ -652,16 +1061,18 @@ class CRTScript(Script):
             try:
                 self.__connect_ssh_2(host, username, password, proxy=proxy, prompt_endings=prompt_endings)
             except ConnectError as e:
-                self.logger.debug("<CONNECT_SSH> Failure trying SSH2: {0}".format(e.message))
+                self.logger.debug("<CONNECT_SSH> Failure trying SSH2: %s", e.message)
                 ssh2_error = e.message
                 try:
                     self.__connect_ssh_1(host, username, password, proxy=proxy, prompt_endings=prompt_endings)
                 except ConnectError as e:
                     ssh1_error = e.message
-                    self.logger.debug("<CONNECT_SSH> Failure trying SSH1: {0}".format(e.message))
+                    self.logger.debug("<CONNECT_SSH> Failure trying SSH1: %s", e.message)
                     error = "SSH2 and SSH1 failed.\nSSH2 Failure:{0}\nSSH1 Failure:{1}".format(ssh2_error, ssh1_error)
                     raise ConnectError(error)
 
+        self.connection_key = key
+
     def connect_telnet(self, host, username, password, proxy=None, prompt_endings=("#", ">")):
         """
         Connects to a device via the Telnet protocol.
@@ -686,7 +1097,7 @@ class CRTScript(Script):
             raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
 
         if proxy:
-            telnet_string="/FIREWALL=Session:\"{0}\" /TELNET {0}".format(proxy, host)
+            telnet_string = "/FIREWALL=Session:\"{0}\" /TELNET {1}".format(proxy, host)
         else:
             telnet_string = "/TELNET {0}".format(host)
 
@@ -696,7 +1107,7 @@ class CRTScript(Script):
             raise ConnectError("Tab is already connected to another device.")
         else:
             try:
-                self.logger.debug("<CONNECT_TELNET> Attempting Connection to: {0} via TELNET".format(host))
+                self.logger.debug("<CONNECT_TELNET> Attempting Connection to: %s via TELNET", host)
                 tab = self.main_session.session.ConnectInTab(telnet_string)
                 tab_index = tab.Index
                 self.main_session = sessions.CRTSession(self, self.crt.GetTab(tab_index), prompt_endings=prompt_endings)
@@ -741,6 +1152,9 @@ class CRTScript(Script):
         if not prompt_endings:
             raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
 
+        if protocol:
+            protocol = protocol.lower()
+
         if not protocol:
             try:
                 self.connect_ssh(host, username, password, proxy=proxy, prompt_endings=prompt_endings)
@@ -749,25 +1163,335 @@ class CRTScript(Script):
                     self.connect_telnet(host, username, password, prompt_endings=prompt_endings)
                 except ConnectError:
                     raise ConnectError("Unable to make a connection with either SSH or Telnet")
-        elif protocol.lower() == "ssh":
+        elif protocol == "ssh":
             self.connect_ssh(host, username, password, proxy=proxy, prompt_endings=prompt_endings)
-        elif protocol.lower() == "ssh2":
+        elif protocol == "ssh2":
             self.connect_ssh(host, username, password, version=2, proxy=proxy, prompt_endings=prompt_endings)
-        elif protocol.lower() == "ssh1":
+        elif protocol == "ssh1":
             self.connect_ssh(host, username, password, version=1, proxy=proxy, prompt_endings=prompt_endings)
-        elif protocol.lower() == "telnet":
+        elif protocol == "telnet":
             self.connect_telnet(host, username, password, proxy=proxy, prompt_endings=prompt_endings)
         else:
             raise ConnectError("Unknown protocol specified.")
 
+    def __open_ssh_tab(self, host, username, password, prompt_endings, wait=True, version=2, proxy=None):
+        """
+        Starts an SSH connection to a device in a new tab.
+
+        :param wait: If True, waits until the login is complete and the device prompt is found.  If False, returns as
+                     soon as the connection is started and __finish_ssh_tab() must be called before using the session.
+        :type wait: bool
+        :param version: The SSH version to connect with (1 or 2).
+        :type version: int
+        :param proxy: The name of a SecureCRT session object to proxy the connection through, if any.
+        :type proxy: str
+
+        :return: A session object for the new tab
+        :rtype: sessions.CRTSession
+        """
+        ssh_string = _ssh_connect_string(version, host, username, password, proxy=proxy)
+        try:
+            self.logger.debug("<NEW_TAB> Attempting Connection to: %s@%s via SSH%s", username, host, version)
+            tab = self.main_session.session.ConnectInTab(ssh_string, wait)
+        except:
+            error = self.crt.GetLastErrorMessage()
+            raise ConnectError(error)
+
+        new_session = sessions.CRTSession(self, tab, prompt_endings=prompt_endings)
+        if wait:
+            self.__finish_ssh_tab(new_session, prompt_endings)
+        return new_session
+
+    def __finish_ssh_tab(self, session, prompt_endings):
+        """
+        Waits for a connection started by __open_ssh_tab() to complete and for the device prompt to be found.
+        """
+        expanded_endings = _expand_endings(prompt_endings)
+
+        session.wait_for_connected()
+        # Set Tab parameters to allow correct sending/receiving of data via SecureCRT
+        session.screen.Synchronous = True
+        session.screen.IgnoreEscape = True
+        self.__post_connect_check(expanded_endings, session=session)
+
+    def __open_telnet_tab(self, host, prompt_endings, proxy=None):
+        """
+        Starts a Telnet connection to a device in a new tab, without waiting for it to connect.  __finish_telnet_tab()
+        must be called to log in before using the session.
+
+        :return: A session object for the new tab
+        :rtype: sessions.CRTSession
+        """
+        if proxy:
+            telnet_string = "/FIREWALL=Session:\"{0}\" /TELNET {1}".format(proxy, host)
+        else:
+            telnet_string = "/TELNET {0}".format(host)
+        try:
+            self.logger.debug("<NEW_TAB> Attempting Connection to: %s via TELNET", host)
+            tab = self.main_session.session.ConnectInTab(telnet_string, False)
+        except:
+            error = self.crt.GetLastErrorMessage()
+            raise ConnectError(error)
+
+        return sessions.CRTSession(self, tab, prompt_endings=prompt_endings)
+
+    def __finish_telnet_tab(self, session, username, password, prompt_endings):
+        """
+        Waits for a connection started by __open_telnet_tab() to complete, logs in and waits for the device prompt.
+        """
+        session.wait_for_connected()
+        # Set Tab parameters to allow correct sending/receiving of data via SecureCRT
+        session.screen.Synchronous = True
+        session.screen.IgnoreEscape = True
+        session.telnet_login(username, password)
+        self.__post_connect_check(prompt_endings, session=session)
+
+    def __open_device_tab(self, device, protocol, prompt_endings, proxy=None):
+        """
+        Starts a connection to a device from a device list in a new tab, without waiting for it to log in.  The
+        connection is made through the device's 'Proxy Session' if it has one, or else through the given proxy.
+
+        :param device: A device dictionary, as returned by import_device_list()
+        :type device: dict
+        :param protocol: The protocol to connect with ("ssh1", "ssh2" or "telnet").  Any other value uses SSH2.
+        :type protocol: str
+        :param proxy: The name of a SecureCRT session object to proxy the connection through, if the device doesn't
+                      have a 'Proxy Session'.
+        :type proxy: str
+
+        :return: A session object for the new tab
+        :rtype: sessions.CRTSession
+        """
+        proxy = device.get('Proxy Session') or proxy
+        if protocol == "telnet":
+            return self.__open_telnet_tab(device['Hostname'], prompt_endings, proxy=proxy)
+        version = 1 if protocol == "ssh1" else 2
+        return self.__open_ssh_tab(device['Hostname'], device['Username'], device['Password'], prompt_endings,
+                                   wait=False, version=version, proxy=proxy)
+
+    def __finish_device_tab(self, device, protocol, session, prompt_endings):
+        """
+        Waits for a connection started by __open_device_tab() to log in and reach the device prompt.
+        """
+        if protocol == "telnet":
+            self.__finish_telnet_tab(session, device['Username'], device['Password'], prompt_endings)
+        else:
+            self.__finish_ssh_tab(session, prompt_endings)
+
+    def __retry_device_tab(self, device, protocol, prompt_endings, proxy=None):
+        """
+        Connects to a device in a new tab after its SSH2 connection failed, using the same fallbacks as connect(): SSH1
+        when the device's protocol is "ssh", or SSH1 and then Telnet when no protocol is given.
+
+        :return: A session object for the new tab
+        :rtype: sessions.CRTSession
+        """
+        fallbacks = ("ssh1",) if protocol == "ssh" else ("ssh1", "telnet")
+        for fallback in fallbacks:
+            session = None
+            try:
+                session = self.__open_device_tab(device, fallback, prompt_endings, proxy=proxy)
+                self.__finish_device_tab(device, fallback, session, prompt_endings)
+                return session
+            except (ConnectError, sessions.InteractionError) as e:
+                self.logger.debug("<NEW_TABS> Failed to connect to %s with %s: %s", device['Hostname'], fallback, e)
+                if session:
+                    self.__close_tab(session)
+        raise ConnectError("Unable to connect to {0} with any protocol.".format(device['Hostname']))
+
+    def __close_tab(self, session, command="exit"):
+        """
+        Disconnects (if needed) and closes the tab for a session that is no longer used, such as a tab opened by
+        __open_ssh_tab() or a connection that was saved for reuse.
+        """
+        try:
+            session.disconnect(command=command)
+        except (ConnectError, sessions.InteractionError):
+            self.logger.debug("<NEW_TAB> Error while disconnecting tab.  Closing anyway.")
+        session.close()
+
+    def ssh_in_new_tab(self, host, username, password, prompt_endings=("#", ">")):
+        """
+        Opens a new tab and connects to the device via SSH2 in that tab.  The main session of the script is not
+        changed.
+
+        If the "reuse_connections" setting is enabled, the tab is left open and a later call for the same host and
+        username returns the same session (if it is still connected) instead of logging in again.  Up to 16 tabs are
+        kept this way, and the least recently used tab is closed when there are more.  Scripts should not close these
+        tabs themselves; they are closed by close_connection_pool().
+
+        :param host: The IP address of DNS name for the device to connect
+        :type host: str
+        :param username: The username to login to the device with
+        :type username: str
+        :param password: The password that goes with the provided username.
+        :type password: str
+        :param prompt_endings: A list of strings that are possible prompt endings to watch for.  The default is for
+                               Cisco devices (">" and "#"), but may need to be changed if connecting to another
+                               type of device (for example "$" for some linux hosts).
+        :type prompt_endings: list
+
+        :return: A session object for the new tab
+        :rtype: sessions.CRTSession
+        """
+        if not prompt_endings:
+            raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
+
+        key = (host, username)
+        if self.reuse_connections:
+            pooled_session = self.tab_pool.pop(key, None)
+            if pooled_session and pooled_session.is_connected():
+                try:
+                    self.__post_connect_check(_expand_endings(prompt_endings), session=pooled_session, idle=True)
+                except sessions.InteractionError:
+                    self.logger.debug("<NEW_TAB> Saved tab for %s@%s is not responding.  Reconnecting.", username, host)
+                    self.__close_tab(pooled_session)
+                else:
+                    self.logger.debug("<NEW_TAB> Reusing existing tab connected to: %s@%s", username, host)
+                    self.tab_pool[key] = pooled_session
+                    return pooled_session
+            elif pooled_session:
+                pooled_session.close()
+
+        new_session = self.__open_ssh_tab(host, username, password, prompt_endings)
+        if self.reuse_connections:
+            self.tab_pool[key] = new_session
+            if len(self.tab_pool) > _MAX_POOLED_TABS:
+                (old_host, _), old_session = self.tab_pool.popitem(last=False)
+                self.logger.debug("<NEW_TAB> Too many saved tabs.  Closing tab connected to %s.", old_host)
+                self.__close_tab(old_session)
+        return new_session
+
+    def ssh_in_new_tabs(self, device_list, max_tabs=8, prompt_endings=("#", ">"), proxy=None):
+        """
+        Connects to each device in a list, each in its own new tab, and returns a generator that provides a session for
+        one device at a time.  Each device is connected with the protocol in its 'Protocol' value and through its
+        'Proxy Session', if it has one.  When the protocol is blank or "ssh", SSH2 is tried first and, like connect(),
+        the connection falls back to SSH1 (and then Telnet, if the protocol is blank) when SSH2 fails.
+
+        SecureCRT scripts cannot use multiple threads, so instead the connections to up to "max_tabs" devices are
+        started without waiting for them to log in.  SecureCRT completes these logins in the background while the
+        script works with the current device.  When the script moves on to the next device, the tab for the previous
+        device is disconnected and closed and a connection to the next device in the list is started.  The default of
+        8 keeps the number of simultaneous logins below the default SSH server MaxStartups limit of 10.
+
+        Devices are provided in list order, except that a device that has already connected is provided before earlier
+        devices that are still connecting, so one slow login doesn't hold up the rest of the list.
+
+        :param device_list: A list of dictionaries with (at least) 'Hostname', 'Username' and 'Password' keys, and
+                            optionally 'Protocol' and 'Proxy Session' keys, such as the list returned by
+                            import_device_list()
+        :type device_list: list of dict
+        :param max_tabs: The maximum number of tabs that are connected (or connecting) at the same time.
+        :type max_tabs: int
+        :param prompt_endings: A list of strings that are possible prompt endings to watch for.  The default is for
+                               Cisco devices (">" and "#"), but may need to be changed if connecting to another
+                               type of device (for example "$" for some linux hosts).
+        :type prompt_endings: list
+        :param proxy: The name of a SecureCRT session object to proxy connections through, for devices that don't have
+                      a 'Proxy Session' of their own.
+        :type proxy: str
+
+        :return: A generator of (device, session) tuples.  The session is None if the connection to the device failed.
+        :rtype: generator
+        """
+        if not prompt_endings:
+            raise ConnectError("Cannot connect without knowing what character ends the CLI prompt.")
+
+        remaining = iter(device_list)
+        pending = collections.deque()
+
+        def start_next():
+            for device in remaining:
+                protocol = device.get('Protocol', "").lower()
+                try:
+                    new_session = self.__open_device_tab(device, protocol, prompt_endings, proxy=proxy)
+                except ConnectError as e:
+                    self.logger.debug("<NEW_TABS> Failed to connect to %s: %s", device['Hostname'], e)
+                    new_session = None
+                pending.append((device, protocol, new_session))
+                return
+
+        try:
+            for _ in range(max_tabs):
+                start_next()
+
+            while pending:
+                # Take the first device that has already connected (or failed to start), or else wait on the oldest.
+                for index, (device, protocol, session) in enumerate(pending):
+                    if not session or session.is_connected():
+                        break
+                else:
+                    index = 0
+                    device, protocol, session = pending[0]
+                del pending[index]
+
+                if session:
+                    try:
+                        self.__finish_device_tab(device, protocol, session, prompt_endings)
+                    except (ConnectError, sessions.InteractionError) as e:
+                        self.logger.debug("<NEW_TABS> Failed to connect to %s: %s", device['Hostname'], e)
+                        self.__close_tab(session)
+                        session = None
+
+                # Like connect(), fall back to the other protocols when SSH2 fails and the device didn't specify one.
+                if not session and protocol in ("", "ssh"):
+                    try:
+                        session = self.__retry_device_tab(device, protocol, prompt_endings, proxy=proxy)
+                    except ConnectError as e:
+                        self.logger.debug("<NEW_TABS> %s", e)
+
+                try:
+                    yield device, session
+                finally:
+                    if session:
+                        self.__close_tab(session)
+                start_next()
+        finally:
+            # If the script stopped early or an error occurred, close the tabs that were opened ahead of time.
+            for _, _, pending_session in pending:
+                if pending_session:
+                    self.__close_tab(pending_session)
+
     def disconnect(self, command="exit"):
         """
         Disconnects the main session used by the script by calling the disconnect method on the session object.
 
+        If the "reuse_connections" setting is enabled, SSH sessions are left connected and saved so that a later
+        connection to the same device can use the same tab.  These are disconnected by close_connection_pool().
+
         :param command: The command to be issued to the remote device to disconnect.  The default is 'exit'
         :type command: str
         """
-        self.main_session.disconnect(command=command)
+        if self.reuse_connections and self.connection_key and self.main_session.is_connected():
+            self.logger.debug("<DISCONNECT> Saving connection to %s for reuse.", self.connection_key[0])
+            self.connection_pool[self.connection_key] = self.main_session
+            self.main_session = self.script_tab_session
+            if len(self.connection_pool) > _MAX_POOLED_TABS:
+                old_key, old_session = self.connection_pool.popitem(last=False)
+                self.logger.debug("<DISCONNECT> Too many saved connections.  Disconnecting from %s.", old_key[0])
+                self.__close_tab(old_session, command=command)
+        else:
+            self.main_session.disconnect(command=command)
+        self.connection_key = None
+
+    def close_connection_pool(self, command="exit"):
+        """
+        Disconnects any sessions that were kept connected for reuse because the "reuse_connections" setting is enabled,
+        including any tabs opened by ssh_in_new_tab().
+
+        :param command: The command to be issued to the remote devices to disconnect.  The default is 'exit'
+        :type command: str
+        """
+        for key, session in self.connection_pool.items():
+            self.logger.debug("<CLOSE_POOL> Disconnecting saved connection to %s.", key[0])
+            self.__close_tab(session, command=command)
+        self.connection_pool.clear()
+
+        for key, session in self.tab_pool.items():
+            self.logger.debug("<CLOSE_POOL> Closing saved tab connected to %s.", key[0])
+            self.__close_tab(session, command=command)
+        self.tab_pool.clear()
 
     def message_box(self, message, title="", options=0):
         """
@@ -787,8 +1511,8 @@ class CRTScript(Script):
         :return: The return code that identifies which button the user pressed. (See Message Box constants)
         :rtype: int
         """
-        self.logger.debug("<MESSAGE_BOX> Creating MessageBox with: \nTitle: {0}\nMessage: {1}\nOptions: {2}"
-                          .format(title, message, options))
+        self.logger.debug("<MESSAGE_BOX> Creating MessageBox with: \nTitle: %s\nMessage: %s\nOptions: %s",
+                          title, message, options)
         return self.crt.Dialog.MessageBox(message, title, options)
 
     def prompt_window(self, message, title="", hide_input=False):
@@ -807,9 +1531,9 @@ class CRTScript(Script):
         :return: The value entered by the user
         :rtype: str
         """
-        self.logger.debug("<PROMPT> Creating Prompt with message: '{0}'".format(message))
+        self.logger.debug("<PROMPT> Creating Prompt with message: '%s'", message)
         result = self.crt.Dialog.Prompt(message, title, "", hide_input)
-        self.logger.debug("<PROMPT> Captures prompt results: '{0}'".format(result))
+        self.logger.debug("<PROMPT> Captures prompt results: '%s'", result)
         return result
 
     def file_open_dialog(self, title, button_label="Open", default_filename="", file_filter=""):
@@ -833,7 +1557,7 @@ class CRTScript(Script):
         :return: The absolute path to the file that was selected
         :rtype: str
         """
-        self.logger.debug("<FILE_OPEN> Creating File Open Dialog with title: '{0}'".format(title))
+        self.logger.debug("<FILE_OPEN> Creating File Open Dialog with title: '%s'", title)
         if 'darwin' in self.host_os:
             self.message_box(title, "Select File", ICON_INFO)
         result_filename = self.crt.Dialog.FileOpenDialog(title, button_label, default_filename, file_filter)
@@ -852,21 +1576,39 @@ class CRTScript(Script):
         :param folder: The folder (starting from the configured Sessions folder) where this session should be saved.
         :type folder: str
         """
-        now = datetime.datetime.now()
-        creation_date = now.strftime("%A, %B %d %Y at %H:%M:%S")
+        self.create_new_saved_sessions([(session_name, ip, protocol, folder)])
 
-        # Create a session from the configured default values.
-        new_session = self.crt.OpenSessionConfiguration("Default")
+    def create_new_saved_sessions(self, session_list):
+        """
+        Creates multiple session objects that can be opened from the Connect menu in SecureCRT.  The "Default" session
+        configuration is only opened once per script, and each session is saved from it after setting its own options.
 
-        # Set options based)
-        new_session.SetOption("Protocol Name", protocol)
-        new_session.SetOption("Hostname", ip)
-        desc = ["Created on {0} by script:".format(creation_date), self.crt.ScriptFullName]
-        new_session.SetOption("Description", desc)
-        session_path = os.path.join(folder, session_name)
-        # Save session based on passed folder and session name.
-        self.logger.debug("<CREATE_SESSION> Creating new session '{0}'".format(session_path))
-        new_session.Save(session_path)
+        :param session_list: A list of (session_name, ip, protocol, folder) tuples, one for each session to create.
+            See create_new_saved_session() for a description of each value.
+        :type session_list: list of tuple
+        """
+        if self.session_template is None:
+            # Create a session from the configured default values.  Every session saved during a script run gets the
+            # same description, so it is only set once.
+            creation_date = _get_launch_timestamp("%A, %B %d %Y at %H:%M:%S")
+            # The script path was already read from SecureCRT when this object was created.
+            script_path = os.path.join(self.script_dir, self.script_name)
+            self.session_template = self.crt.OpenSessionConfiguration("Default")
+            self.session_template.SetOption("Description",
+                                            ["Created on {0} by script:".format(creation_date), script_path])
+        new_session = self.session_template
+
+        for session_name, ip, protocol, folder in session_list:
+            # Set options based on the session being created.  The protocol is usually the same for every session, so
+            # it is only set when it changes.
+            if protocol != self.session_template_protocol:
+                new_session.SetOption("Protocol Name", protocol)
+                self.session_template_protocol = protocol
+            new_session.SetOption("Hostname", ip)
+            session_path = os.path.join(folder, session_name)
+            # Save session based on passed folder and session name.
+            self.logger.debug("<CREATE_SESSION> Creating new session '%s'", session_path)
+            new_session.Save(session_path)
 
 
 class DebugScript(Script):
@@ -985,6 +1727,15 @@ class DebugScript(Script):
         """
         self.main_session.disconnect(command=command)
 
+    def close_connection_pool(self, command="exit"):
+        """
+        Connections are never kept for reuse when running directly, so there is nothing to disconnect.
+
+        :param command: The command to be issued to the remote devices to disconnect.  The default is 'exit'
+        :type command: str
+        """
+        pass
+
     def message_box(self, message, title="", options=0):
         """
         Prints a message for the user.  When used in a DirectSession, the message is printed to the console and the
@@ -1004,42 +1755,24 @@ class DebugScript(Script):
         :return: The return code that identifies which button the user pressed. (See Message Box constants)
         :rtype: int
         """
-        def get_button_layout(option):
-            # These numbers signify default buttons and icons shown.  We don't care about these when using console.
-            numbers = [512, 256, 64, 48, 32, 16]
-
-            for number in numbers:
-                if option >= number:
-                    option -= number
-
-            return option
+        self.logger.debug("<MESSAGEBOX> Creating Message Box, with Title: %s, Message: %s, and Options: %s",
+                          title, message, options)
+        # Extract the layout paramter in the options field.  The icon and default button don't matter on the console.
+        layout = options & _BUTTON_LAYOUT_MASK
+        self.logger.debug("<MESSAGEBOX> Layout Value is: %s", layout)
 
-        def get_response_code(text):
-            responses = {"OK": IDOK, "Cancel": IDCANCEL, "Yes": IDYES, "No": IDNO, "Retry": IDRETRY, "Abort": IDABORT,
-                         "Ignore": IDIGNORE}
-            return responses[text]
-
-        self.logger.debug("<MESSAGEBOX> Creating Message Box, with Title: {0}, Message: {1}, and Options: {2}"
-                          .format(title, message, options))
-        # Extract the layout paramter in the options field
-        layout = get_button_layout(options)
-        self.logger.debug("<MESSAGEBOX> Layout Value is: {0}".format(layout))
-
-        # A mapping of each integer value and which buttons are shown in a MessageBox, so we can prompt for the
-        # same values from the console
-        buttons = {BUTTON_OK: ["OK"], BUTTON_CANCEL: ["OK", "Cancel"],
-                   BUTTON_ABORTRETRYIGNORE: ["Abort", "Retry", "Ignore"],
-                   BUTTON_YESNOCANCEL: ["Yes", "No", "Cancel"], BUTTON_YESNO: ["Yes", "No"],
-                   BUTTON_RETRYCANCEL: ["Retry", "Cancel"]}
+        # Prompt for the same buttons that would be shown in a MessageBox.
+        choices = _MESSAGE_BOX_CHOICES[layout]
+        prompt = _MESSAGE_BOX_PROMPTS[layout]
 
         print "{0}: {1}".format(message, title)
         response = ""
-        while response not in buttons[layout]:
-            response = raw_input("Choose from {0}: ".format(buttons[layout]))
-            self.logger.debug("<MESSAGEBOX> Received: {0}".format(response))
+        while response not in choices:
+            response = _console_input(prompt).strip().lower()
+            self.logger.debug("<MESSAGEBOX> Received: %s", response)
 
-        code = get_response_code(response)
-        self.logger.debug("<MESSAGEBOX> Returning Response Code: {0}".format(code))
+        code = _MESSAGE_BOX_RESPONSES[response]
+        self.logger.debug("<MESSAGEBOX> Returning Response Code: %s", code)
         return code
 
     def prompt_window(self, message, title="", hide_input=False):
@@ -1058,13 +1791,15 @@ class DebugScript(Script):
         :return: The value entered by the user
         :rtype: str
         """
-        self.logger.debug("<PROMPT> Creating Prompt with message: '{0}'".format(message))
+        self.logger.debug("<PROMPT> Creating Prompt with message: '%s'", message)
         if hide_input:
+            # Only needed when running outside SecureCRT, so it isn't imported at the top of the module.
+            import getpass
             result = getpass.getpass(message)
-            self.logger.debug("<PROMPT> Captures hidden result (likely a password)".format(result))
+            self.logger.debug("<PROMPT> Captures hidden result (likely a password)")
         else:
-            result = raw_input("{0}: ".format(message))
-            self.logger.debug("<PROMPT> Captures prompt results: '{0}'".format(result))
+            result = _console_input("{0}: ".format(message))
+            self.logger.debug("<PROMPT> Captures prompt results: '%s'", result)
 
         return result
 
@@ -1089,7 +1824,7 @@ class DebugScript(Script):
         :return: The absolute path to the file that was selected
         :rtype: str
         """
-        result_filename = raw_input("{0} (type {0}): ".format(title, file_filter))
+        result_filename = _console_input("{0} (type {1}): ".format(title, file_filter))
         return result_filename
 
     def ssh_in_new_tab(self, host, username, password, prompt_endings=("#", ">")):
@@ -1112,6 +1847,30 @@ class DebugScript(Script):
         """
         return sessions.DebugSession(self)
 
+    def ssh_in_new_tabs(self, device_list, max_tabs=8, prompt_endings=("#", ">"), proxy=None):
+        """
+        Pretends to connect to each device in a list in a new tab.  Returns a generator with a new Session object for
+        each device.
+
+        :param device_list: A list of dictionaries with (at least) 'Hostname', 'Username' and 'Password' keys, such as
+                            the list returned by import_device_list()
+        :type device_list: list of dict
+        :param max_tabs: The maximum number of tabs that are connected at the same time (only for API compatibility -
+                         not used)
+        :type max_tabs: int
+        :param prompt_endings: A list of strings that are possible prompt endings to watch for.  (only for API
+                               compatibility - not used)
+        :type prompt_endings: list
+        :param proxy: The name of a SecureCRT session object to proxy connections through.  (only for API
+                      compatibility - not used)
+        :type proxy: str
+
+        :return: A generator of (device, session) tuples.
+        :rtype: generator
+        """
+        for device in device_list:
+            yield device, self.ssh_in_new_tab(device['Hostname'], device['Username'], device['Password'])
+
     def create_new_saved_session(self, session_name, ip, protocol="SSH2", folder="_imports"):
         """
         Pretends to create a new SecureCRT session.  Since we aren't running in SecureCRT, it does nothing except
@@ -1126,6 +1885,18 @@ class DebugScript(Script):
         :param folder: The folder (starting from the configured Sessions folder) where this session should be saved.
         :type folder: str
         """
-        print "Pretending to save session {0} with hostname: {1}, protocol: {2}, under folder: {3}"\
-              .format(session_name, ip, protocol, folder)
+        self.create_new_saved_sessions([(session_name, ip, protocol, folder)])
+
+    def create_new_saved_sessions(self, session_list):
+        """
+        Pretends to create multiple SecureCRT sessions.  Since we aren't running in SecureCRT, it does nothing except
+        print a message for each device that was created.
+
+        :param session_list: A list of (session_name, ip, protocol, folder) tuples, one for each session to create.
+            See create_new_saved_session() for a description of each value.
+        :type session_list: list of tuple
+        """
+        # Write the messages for all of the sessions at once, instead of a print for each one.
+        sys.stdout.write("".join("Pretending to save session %s with hostname: %s, protocol: %s, under folder: %s\n"
+                                 % tuple(session) for session in session_list))
 
@@ -25,12 +25,117 @@ where their logic is having trouble with a particular output.
 import os
 import sys
 import logging
+import mmap
 import time
+import random
 import re
 from abc import ABCMeta, abstractmethod
 from message_box_const import *
 from utilities import path_safe_name
 
+# ################################################    CONSTANTS      ###################################################
+
+# RegEx to find a number, used to extract terminal length and width values
+_RE_NUM = re.compile(r'\d+')
+
+# RegEx to match the whitespace and backspace commands after --More-- prompt
+_RE_MORE = re.compile(r' [\b]+[ ]+[\b]+(?P<line>.*)')
+
+# RegEx to find the system name in the AireOS "show sysinfo" output
+_RE_AIREOS_SYSNAME = re.compile(r'\s*System\s+Name\s*\.+\s*(.*)')
+
+# The different types of lines we want to match (MatchIndex) when capturing output, after the device prompt.  The
+# first 3 entries are line endings and the rest are "More" prompts, which vary by OS.
+_OUTPUT_MATCHES = {
+    "AireOS": ["\r\n", '\r', '\n',
+               'Press Enter to continue...',
+               'Press Enter to continue or <[Cc]trl-[Zz]> to abort',
+               '--More or (q)uit current module or <[Cc]trl-[Zz]> to abort', '--More-- or (q)uit'],
+    "IOS": ["\r\n", '\r', '\n', '--More--'],
+    "NXOS": ["\r\n", '\r', '\n', '--More--'],
+    "ASA": ["\r\n", '\r', '\n', '<--- More --->'],
+}
+_DEFAULT_OUTPUT_MATCHES = ["\r\n", '\r', '\n', '--More--']
+
+# Captured output is collected in a buffer and written to the output file in chunks of (at least) this many bytes.
+_WRITE_BUFFER_SIZE = 512 * 1024
+
+# Buffer size used when opening output files, so that smaller writes are still passed to the OS in large blocks.
+_FILE_BUFFER_SIZE = 1024 * 1024
+
+# Characters removed from saved output files: carriage returns and anything that isn't ASCII.
+_CR_AND_NON_ASCII = "\r" + "".join(chr(i) for i in range(128, 256))
+
+# Sent to the device to discover its prompt.  The device echoes the test string after its prompt, and the backspaces
+# erase it again.
+_PROMPT_TEST_STRING = "!&%"
+_PROMPT_TEST_SEND = "\n" + _PROMPT_TEST_STRING + "\b" * len(_PROMPT_TEST_STRING)
+
+# Sent after the prompt test string had to be resent, to read any late echoes of it off the screen.
+_PROMPT_MARKER_STRING = "!@&^"
+_PROMPT_MARKER_SEND = _PROMPT_MARKER_STRING + "\b" * len(_PROMPT_MARKER_STRING)
+
+# Resolved (real) paths of directories passed to create_output_filename, keyed by the directory given.
+_real_paths = {}
+
+
+# ################################################    FUNCTIONS      ###################################################
+
+
+def _backoff(attempt, base=0.025, cap=0.4):
+    """
+    Returns how long to sleep (in seconds) before the next retry of a polling loop.  The delay doubles with each
+    attempt, up to the cap, and has a small amount of random jitter added.
+
+    :param attempt: The number of attempts that have already been made (starting at 0)
+    :type attempt: int
+    :param base: The delay for the first attempt
+    :type base: float
+    :param cap: The maximum delay, before jitter is added
+    :type cap: float
+
+    :return: The number of seconds to sleep
+    :rtype: float
+    """
+    return min(cap, base * 2 ** attempt) * (1 + random.random() * 0.25)
+
+
+def _encode_lines(lines):
+    """
+    Joins captured lines into a single block of text, with a newline after each line.  The block is encoded as ASCII
+    in one pass, dropping any characters that can't be encoded (a rare error on Nexus).
+
+    :param lines: The lines of output to join
+    :type lines: list
+
+    :return: The encoded block of text
+    :rtype: str
+    """
+    return ("\n".join(lines) + "\n").encode('ascii', 'ignore')
+
+
+def _read_file(filename):
+    """
+    Returns the full contents of a file.  The file is read through a read-only memory map, so the data is copied
+    once out of the page cache instead of through the file object's read buffer.
+
+    :param filename: The path to the file to read
+    :type filename: str
+
+    :return: The contents of the file
+    :rtype: str
+    """
+    with open(filename, 'rb') as input_file:
+        # A zero length file can't be mapped.
+        if os.fstat(input_file.fileno()).st_size == 0:
+            return ""
+        mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return mapped_file[:]
+        finally:
+            mapped_file.close()
+
+
 # ################################################    EXCEPTIONS     ###################################################
 
 
@@ -48,6 +153,13 @@ class UnsupportedOSError(Exception):
     pass
 
 
+class ConnectError(Exception):
+    """
+    An exception type that is raised when there are problems connecting to a device.
+    """
+    pass
+
+
 # ##############################################    SESSION TYPES     ##################################################
 
 
@@ -90,15 +202,18 @@ class Session:
         :rtype: str
         """
 
-        self.logger.debug("<CREATE_FILENAME> Starting creation of filename with Desc: {0}, Base Dir: {1}, ext: {2}, "
-                          "include_date: {3}".format(desc, base_dir, ext, include_date))
+        self.logger.debug("<CREATE_FILENAME> Starting creation of filename with Desc: %s, Base Dir: %s, ext: %s, "
+                          "include_date: %s", desc, base_dir, ext, include_date)
 
         if base_dir:
-            save_path = os.path.realpath(base_dir)
+            # Resolving a path hits the filesystem for every part of it, so only do it once per directory.
+            save_path = _real_paths.get(base_dir)
+            if save_path is None:
+                save_path = _real_paths[base_dir] = os.path.realpath(base_dir)
         else:
             save_path = self.script.output_dir
 
-        self.logger.debug("<CREATE_FILENAME> Save Location: {0}".format(save_path))
+        self.logger.debug("<CREATE_FILENAME> Save Location: %s", save_path)
 
         if include_hostname:
             self.logger.debug("<CREATE_FILENAME> Using hostname.")
@@ -115,7 +230,7 @@ class Session:
             my_date = ""
 
         file_bits = [hostname, desc, my_date]
-        self.logger.debug("<CREATE_FILENAME> Using {0} to create filename".format(file_bits))
+        self.logger.debug("<CREATE_FILENAME> Using %s to create filename", file_bits)
         # Create filename, stripping off leading or trailing "-" if some fields are not used.
         filename = '-'.join(file_bits).strip("-")
         # Remove reserved characters from the filename
@@ -126,7 +241,7 @@ class Session:
         else:
             filename = "{0}.{1}".format(filename, ext)
         file_path = os.path.join(save_path, filename)
-        self.logger.debug("<CREATE_FILENAME> Final Filename: {0}".format(file_path))
+        self.logger.debug("<CREATE_FILENAME> Final Filename: %s", file_path)
 
         return file_path
 
@@ -140,7 +255,7 @@ class Session:
         :param valid_os_list: A list of OSs that
         """
         if self.os not in valid_os_list:
-            self.logger.debug("Unsupported OS: {0} not in {1}.  Raising exception.".format(self.os, valid_os_list))
+            self.logger.debug("Unsupported OS: %s not in %s.  Raising exception.", self.os, valid_os_list)
             raise UnsupportedOSError("Remote device running unsupported OS: {0}.".format(self.os))
 
     @abstractmethod
@@ -236,7 +351,7 @@ class Session:
         pass
 
     @abstractmethod
-    def send_config_commands(self, command_list, output_filename=None):
+    def send_config_commands(self, command_list, output_filename=None, strict=True):
         """
         This method accepts a list of strings, where each string is a command to be sent to the device.
 
@@ -252,6 +367,11 @@ class Session:
         :param output_filename: (Optional) If a absolute path to a file is specified, the config session output from
                                 applying the commands will be written to this file.
         :type output_filename: str
+        :param strict: If True (default), each command is sent separately and the config prompt must be received
+                       before the next command is sent.  If False, all commands are sent at once and only the final
+                       prompt is waited for.  This is faster for long command lists, but a device with a small input
+                       buffer may drop commands, and errors are only found after every command has been sent.
+        :type strict: bool
         """
         pass
 
@@ -270,6 +390,11 @@ class CRTSession(Session):
     disconnect from devices or interact with devices that are connected within the specific SecureCRT tab that this
     object represents.
     """
+    # Device details that were discovered when starting a Cisco session, keyed by (remote IP, prompt without the
+    # trailing character).  These are shared by all CRTSession objects so that when a script starts another session
+    # to the same device the discovery commands don't need to be sent again.
+    _os_cache = {}
+    _term_info_cache = {}
 
     def __init__(self, script, tab, prompt_endings=None):
         super(CRTSession, self).__init__()
@@ -279,8 +404,20 @@ class CRTSession(Session):
         self.tab = tab
         self.screen = tab.Screen
         self.session = tab.Session
+        # Keep references to the Screen methods that are called most often, so they are only looked up through the
+        # SecureCRT API once instead of on every call.
+        self._screen_send = self.screen.Send
+        self._screen_read_string = self.screen.ReadString
+        self._screen_wait_for_string = self.screen.WaitForString
+        self._screen_wait_for_strings = self.screen.WaitForStrings
         self.response_timeout = self.script.settings.getint("Global", "response_timeout")
         self.session_set_sync = False
+        # Set when start_cisco_session turns off paging, so captures don't need to watch for "--More--" prompts.
+        self.paging_disabled = False
+        # Stripped versions of commands sent to the device, so repeated commands aren't re-stripped on every send.
+        self._strip_cache = {}
+        # The key of the device in the class-level caches, set once start_cisco_session has discovered the prompt.
+        self._device_key = None
 
         if not self.is_connected():
             self.logger.debug("<SESSION_INIT> Session not connected prior to creating object.")
@@ -289,29 +426,51 @@ class CRTSession(Session):
 
     def __send(self, command):
         if self.is_connected():
-            self.screen.Send(command)
-            result = self.screen.WaitForString(command.strip(), self.response_timeout)
+            try:
+                stripped = self._strip_cache[command]
+            except KeyError:
+                if len(self._strip_cache) >= 256:
+                    self._strip_cache.clear()
+                stripped = self._strip_cache[command] = command.strip()
+            self._screen_send(command)
+            result = self._screen_wait_for_string(stripped, self.response_timeout)
             if not result:
-                self.logger.debug("<__send> Timed out waiting for '{0}' from device.".format(command))
+                self.logger.debug("<__send> Timed out waiting for '%s' from device.", command)
                 raise InteractionError("Timed out waiting for sent command to be echoed back to us.")
             else:
                 return result
         else:
-            self.logger.debug("<__send> Not connected. Error.".format(command))
+            self.logger.debug("<__send> Not connected. Error.")
+            raise InteractionError("Session is not connected.  Cannot send command.")
+
+    def __send_commands(self, command_list):
+        """
+        Sends a list of commands to the device in a single Send, then waits for the prompt that follows the last
+        command.  This avoids waiting for a round trip to the device after every command.
+
+        :param command_list: A list of commands (without line endings) to send to the device
+        :type command_list: list
+        """
+        if not self.is_connected():
+            self.logger.debug("<__send_commands> Not connected. Error.")
             raise InteractionError("Session is not connected.  Cannot send command.")
+        self._screen_send("".join("{0}\n".format(command) for command in command_list))
+        # Wait for the echo of the last command first, so the prompt we wait for is the one that follows it.
+        self.__wait_for_string(command_list[-1])
+        self.__wait_for_string(self.prompt)
 
     def __wait_for_string(self, wait_string):
-        result = self.screen.WaitForString(wait_string, self.response_timeout)
+        result = self._screen_wait_for_string(wait_string, self.response_timeout)
         if not result:
-            self.logger.debug("<__wait_for_string> Timed out waiting for '{0}' from device.".format(wait_string))
+            self.logger.debug("<__wait_for_string> Timed out waiting for '%s' from device.", wait_string)
             raise InteractionError("Timeout waiting for response from device.")
         else:
             return result
 
     def __wait_for_strings(self, string_list):
-        result = self.screen.WaitForStrings(string_list, self.response_timeout)
+        result = self._screen_wait_for_strings(string_list, self.response_timeout)
         if not result:
-            self.logger.debug("<__wait_for_strings> Timed out waiting for '{0}' from device.".format(string_list))
+            self.logger.debug("<__wait_for_strings> Timed out waiting for '%s' from device.", string_list)
             raise InteractionError("Timeout waiting for response from device.")
         else:
             return result
@@ -325,10 +484,10 @@ class CRTSession(Session):
         """
         session_connected = self.session.Connected
         if session_connected == 1:
-            self.logger.debug("<IS_CONNECTED> Checking Connected Status.  Got: {0} (True)".format(session_connected))
+            self.logger.debug("<IS_CONNECTED> Checking Connected Status.  Got: %s (True)", session_connected)
             return True
         else:
-            self.logger.debug("<IS_CONNECTED> Checking Connected Status.  Got: {0} (False)".format(session_connected))
+            self.logger.debug("<IS_CONNECTED> Checking Connected Status.  Got: %s (False)", session_connected)
             return False
 
     def wait_for_connected(self, timeout_sec=15):
@@ -338,7 +497,7 @@ class CRTSession(Session):
             time.sleep(increment)
             total_time += increment
         if total_time > timeout_sec:
-            raise self.script.ConnectError("Timed out while waiting for a connection.")
+            raise ConnectError("Timed out while waiting for a connection.")
 
     def telnet_login(self, username, password):
         """
@@ -353,7 +512,7 @@ class CRTSession(Session):
         self.__wait_for_strings("sername")
         self.__send("{0}\n".format(username))
         self.__wait_for_string("assword")
-        self.screen.Send("{0}\n".format(password))
+        self._screen_send("{0}\n".format(password))
 
     def disconnect(self, command="exit"):
         """
@@ -364,7 +523,7 @@ class CRTSession(Session):
         :type command: str
         """
         if self.is_connected():
-            self.logger.debug("<DISCONNECT> Sending '{0}' command.".format(command))
+            self.logger.debug("<DISCONNECT> Sending '%s' command.", command)
             self.__send("{0}\n".format(command))
         else:
             self.logger.debug("<DISCONNECT> Session already disconnected.  Doing nothing.")
@@ -373,16 +532,31 @@ class CRTSession(Session):
         self.screen.Synchronous = False
         self.screen.IgnoreEscape = False
 
-        # Give a little time and check if we are disconnected.  If not, force it.
-        time.sleep(0.25)
+        # Give the device a short time to close the session on its own.  If it doesn't, force it.
+        session = self.session
+        for _ in range(25):
+            if session.Connected != 1:
+                return
+            time.sleep(0.01)
         attempts = 0
-        while self.is_connected() and attempts < 10:
+        while session.Connected == 1 and attempts < 10:
             self.logger.debug("<DISCONNECT> Not disconnected.  Attempting ungraceful disconnect.")
-            self.session.Disconnect()
-            time.sleep(0.1)
+            session.Disconnect()
+            time.sleep(_backoff(attempts))
             attempts += 1
         if attempts >= 10:
-            raise self.script.ConnectError("Unable to disconnect from session.")
+            self._forget_device()
+            raise ConnectError("Unable to disconnect from session.")
+
+    def _forget_device(self):
+        """
+        Removes the details cached by start_cisco_session for the device this session is connected to, so that they are
+        discovered again the next time a session to the device is started.
+        """
+        if self._device_key:
+            self.logger.debug("<FORGET> Removing cached details for %s", self._device_key)
+            CRTSession._os_cache.pop(self._device_key, None)
+            CRTSession._term_info_cache.pop(self._device_key, None)
 
     def close(self):
         """
@@ -440,85 +614,87 @@ class CRTSession(Session):
                 pass
             raise InteractionError("Please re-run this script when not in configuration mode.")
 
-        # MOD-GROGIER moved OS detect to before enable attempt to allow for WLC AireOS exception
-        # Detect the OS of the device, because outputs will differ per OS
-        self.os = self.__get_network_os()
-        self.logger.debug("<START> Discovered OS: {0}".format(self.os))
+        device_key = self._device_key = (self.remote_ip, self.prompt[:-1])
+        try:
+            # MOD-GROGIER moved OS detect to before enable attempt to allow for WLC AireOS exception
+            # Detect the OS of the device, because outputs will differ per OS
+            if device_key in CRTSession._os_cache:
+                self.os = CRTSession._os_cache[device_key]
+                self.logger.debug("<START> Using previously discovered OS: %s", self.os)
+            else:
+                self.os = self.__get_network_os()
+                CRTSession._os_cache[device_key] = self.os
+                self.logger.debug("<START> Discovered OS: %s", self.os)
 
-        # MOD-GROGIER get hostname from sysInfo
-        if self.os == "AireOS":
-            self.hostname = "AireOS"
+            # MOD-GROGIER get hostname from sysInfo
+            if self.os == "AireOS":
+                self.hostname = "AireOS"
 
-            matches = [self.prompt, "\r\n", '\r', '\n',
-                       'Press Enter to continue...', 'Press Enter to continue or <ctrl-z> to abort',
-                       '--More or (q)uit current module or <ctrl-z> to abort', '--More-- or (q)uit']
-            self.__send("show sysinfo\n")
+                matches = [self.prompt, "\r\n", '\r', '\n',
+                           'Press Enter to continue...', 'Press Enter to continue or <ctrl-z> to abort',
+                           '--More or (q)uit current module or <ctrl-z> to abort', '--More-- or (q)uit']
+                self.__send("show sysinfo\n")
 
-            # Loop to capture every line of the command. If we get our prompt back (which won't have CRLF),
-            # break the loop b/c we found the end of the output.
-            while True:
-                nextline = self.screen.ReadString(matches, self.response_timeout)
-                if self.screen.MatchIndex == 0:
-                    raise InteractionError("Timeout trying to capture output")
-                elif self.screen.MatchIndex == 1:
-                    # We got our prompt, so break the loop
-                    break
-                elif self.screen.MatchIndex <= 4:
-                    # Strip newlines from front and back of line.
-                    nextline = nextline.strip('\r\n')
-                    # If there is something left, check it.
-                    if nextline != "":
-                        re_sysName_exp = r'\s*System\s+Name\s*\.+\s*(.*)'
-                        re_sysName = re.compile(re_sysName_exp)
-                        sysName = re_sysName.search(nextline)
-                        if sysName:
-                            self.hostname = sysName.group(1).strip(u"\r\n\b ")
-                elif self.screen.MatchIndex > 4:
-                    # If we get a --More-- send a space character
-                    self.screen.Send(" ")
-                else:
-                    raise InteractionError("Unknown ReadString result")
-
-        else:
-            self.hostname = self.prompt[:-1]
-        self.logger.debug("<START> Set Hostname: {0}".format(self.hostname))
+                # Loop to capture every line of the command. If we get our prompt back (which won't have CRLF),
+                # break the loop b/c we found the end of the output.
+                while True:
+                    nextline = self._screen_read_string(matches, self.response_timeout)
+                    match_index = self.screen.MatchIndex
+                    if match_index == 0:
+                        raise InteractionError("Timeout trying to capture output")
+                    elif match_index == 1:
+                        # We got our prompt, so break the loop
+                        break
+                    elif match_index <= 4:
+                        # Strip newlines from front and back of line.
+                        nextline = nextline.strip('\r\n')
+                        # If there is something left, check it.
+                        if nextline != "":
+                            sysName = _RE_AIREOS_SYSNAME.search(nextline)
+                            if sysName:
+                                self.hostname = sysName.group(1).strip(u"\r\n\b ")
+                    elif match_index > 4:
+                        # If we get a --More-- send a space character
+                        self._screen_send(" ")
+                    else:
+                        raise InteractionError("Unknown ReadString result")
 
-        # MOD-GROGIER only do enable if not AireOS
-        if not self.os == "AireOS":
-            self.__enter_enable(enable_pass, prompt_for_enable)
+            else:
+                self.hostname = self.prompt[:-1]
+            self.logger.debug("<START> Set Hostname: %s", self.hostname)
 
-        # Get terminal length and width, so we can revert back after changing them.
-        self.term_len, self.term_width = self.__get_term_info()
-        self.logger.debug("<START> Discovered Term Len: {0}, Term Width: {1}".format(self.term_len, self.term_width))
+            # MOD-GROGIER only do enable if not AireOS
+            if not self.os == "AireOS":
+                self.__enter_enable(enable_pass, prompt_for_enable)
 
-        # If modify_term setting is True, then prevent "--More--" prompt (length) and wrapping of lines (width)
-        if self.script.settings.getboolean("Global", "modify_term"):
-            self.logger.debug("<START> Modify Term setting is set.  Sending commands to adjust terminal")
-            if self.os == "AireOS":
-                # Send config paging disable and wait for prompt to return
-                if self.term_len:
-                    self.__send('config paging disable\n')
-                    self.__wait_for_string(self.prompt)
-            elif self.os == "IOS" or self.os == "NXOS":
-                # Send term length command and wait for prompt to return
-                if self.term_len:
-                    self.__send('term length 0\n')
-                    self.__wait_for_string(self.prompt)
-            elif self.os == "ASA":
+            # Get terminal length and width, so we can revert back after changing them.
+            if device_key in CRTSession._term_info_cache:
+                self.term_len, self.term_width = CRTSession._term_info_cache[device_key]
+            else:
+                self.term_len, self.term_width = self.__get_term_info()
+                # Only remember the values when they were found, so a failed lookup is retried by the next session.
                 if self.term_len:
-                    self.__send('terminal pager 0\r\n')
-                    self.__wait_for_string(self.prompt)
-
-            # Send term width command and wait for prompt to return (depending on platform)
+                    CRTSession._term_info_cache[device_key] = (self.term_len, self.term_width)
+            self.logger.debug("<START> Discovered Term Len: %s, Term Width: %s", self.term_len, self.term_width)
 
-            if self.os == "IOS":
-                if self.term_len:
-                    self.__send('term width 0\n')
-                    self.__wait_for_string(self.prompt)
-            elif self.os == "NXOS":
+            # If modify_term setting is True, then prevent "--More--" prompt (length) and wrapping of lines (width)
+            if self.script.modify_term:
+                self.logger.debug("<START> Modify Term setting is set.  Sending commands to adjust terminal")
                 if self.term_len:
-                    self.__send('term width 511\n')
-                    self.__wait_for_string(self.prompt)
+                    # Send the term length (and width, depending on platform) commands together and wait for the prompt
+                    if self.os == "AireOS":
+                        self.__send_commands(['config paging disable'])
+                    elif self.os == "IOS":
+                        self.__send_commands(['term length 0', 'term width 0'])
+                    elif self.os == "NXOS":
+                        self.__send_commands(['term length 0', 'term width 511'])
+                    elif self.os == "ASA":
+                        self.__send_commands(['terminal pager 0'])
+                    self.paging_disabled = self.os in ("AireOS", "IOS", "NXOS", "ASA")
+        except InteractionError:
+            # Whatever was cached for this device may be what caused the failure, so discover it again next time.
+            self._forget_device()
+            raise
 
         # Added due to Nexus echoing twice if system hangs and hasn't printed the prompt yet.
         # Seems like maybe the previous WaitFor prompt isn't always working correctly.  Something to look into.
@@ -537,21 +713,21 @@ class CRTSession(Session):
         self.logger.debug("<END> Ending Session")
         if self.tab:
             if self.prompt:
-                if self.script.settings.getboolean("Global", "modify_term"):
+                if self.script.modify_term:
                     self.logger.debug("<END> Modify Term setting is set.  Sending commands to return terminal "
                                       "to normal.")
                     if self.os == "IOS" or self.os == "NXOS":
+                        # Set term length and width back to saved values
+                        restore_commands = []
                         if self.term_len:
-                            # Set term length back to saved values
-                            self.__send('term length {0}\n'.format(self.term_len))
-                            self.__wait_for_string(self.prompt)
-
+                            restore_commands.append('term length {0}'.format(self.term_len))
                         if self.term_width:
-                            # Set term width back to saved values
-                            self.__send('term width {0}\n'.format(self.term_width))
-                            self.__wait_for_string(self.prompt)
+                            restore_commands.append('term width {0}'.format(self.term_width))
+                        if restore_commands:
+                            self.__send_commands(restore_commands)
                     elif self.os == "ASA":
-                        self.screen.Send("terminal pager {0}\n".format(self.term_len))
+                        self._screen_send("terminal pager {0}\n".format(self.term_len))
+                self.paging_disabled = False
 
             self.prompt = None
             self.logger.debug("<END> Deleting learned Prompt.")
@@ -600,7 +776,7 @@ class CRTSession(Session):
                         pass
                     raise InteractionError("Unable to enter Enable mode. No password set.")
                 if result == 2:
-                    self.screen.Send("{0}\n".format(enable_pass))
+                    self._screen_send("{0}\n".format(enable_pass))
                     self.__wait_for_string("#")
                     self.prompt = self.__get_prompt()
                 else:
@@ -626,18 +802,27 @@ class CRTSession(Session):
         result = ''
         attempts = 0
         while result == '' and attempts < 3:
-            test_string = "\n!&%\b\b\b"
-            self.screen.Send(test_string)
-            result = self.screen.ReadString("!&%", self.response_timeout)
+            self._screen_send(_PROMPT_TEST_SEND)
             attempts += 1
-            self.logger.debug("<CONNECT> Attempt {0}: Prompt result = {1}".format(attempts, result))
+            # An idle device returns the prompt right away, so first wait only briefly.  If it isn't found, keep waiting
+            # (up to the response timeout) for the test string already sent before sending it again.
+            result = self._screen_read_string(_PROMPT_TEST_STRING, 250, True)
+            if result == '':
+                result = self._screen_read_string(_PROMPT_TEST_STRING, self.response_timeout)
+            self.logger.debug("<CONNECT> Attempt %s: Prompt result = %s", attempts, result)
+
+        if result and attempts > 1:
+            # The echo found may be from an earlier attempt, leaving later echoes on the screen.  The device echoes
+            # input in order, so waiting for a different marker reads past all of them.
+            self._screen_send(_PROMPT_MARKER_SEND)
+            self._screen_wait_for_string(_PROMPT_MARKER_STRING, self.response_timeout)
 
         prompt = result.strip(u"\r\n\b ")
         if prompt == '':
             self.logger.debug("<GET PROMPT> Prompt discovery failed.  Raising exception.")
             raise InteractionError("Unable to discover device prompt")
 
-        self.logger.debug("<GET PROMPT> Discovered prompt as '{0}'.".format(prompt))
+        self.logger.debug("<GET PROMPT> Discovered prompt as '%s'.", prompt)
         return prompt
 
     def __get_network_os(self):
@@ -653,7 +838,7 @@ class CRTSession(Session):
             send_cmd = "show version | i Cisco"
             raw_version = self.__get_output(send_cmd)
 
-        self.logger.debug("<GET OS> show version output: {0}".format(raw_version))
+        self.logger.debug("<GET OS> show version output: %s", raw_version)
 
         lower_version = raw_version.lower()
 
@@ -681,9 +866,6 @@ class CRTSession(Session):
 
         :return: A 2-tuple containing the terminal length and the terminal width
         """
-        re_num_exp = r'\d+'
-        re_num = re.compile(re_num_exp)
-
         length = None
         width = None
 
@@ -696,22 +878,22 @@ class CRTSession(Session):
             result = self.__get_output("show terminal | i Length")
             term_info = result.split(',')
 
-            re_length = re_num.search(term_info[0])
+            re_length = _RE_NUM.search(term_info[0])
             if re_length:
                 length = re_length.group(0)
 
-            re_width = re_num.search(term_info[1])
+            re_width = _RE_NUM.search(term_info[1])
             if re_width:
                 width = re_width.group(0)
 
         elif self.os == "ASA":
             pager = self.__get_output("show pager")
-            re_length = re_num.search(pager)
+            re_length = _RE_NUM.search(pager)
             if re_length:
                 length = re_length.group(0)
 
             term_info = self.__get_output("show terminal")
-            re_width = re_num.search(term_info[1])
+            re_width = _RE_NUM.search(term_info[1])
             if re_width:
                 width = re_width.group(0)
 
@@ -733,7 +915,7 @@ class CRTSession(Session):
         self.__send(command.strip() + '\n')
 
         # Capture the output until we get our prompt back and write it to the file
-        result = self.screen.ReadString(self.prompt, self.response_timeout)
+        result = self._screen_read_string(self.prompt, self.response_timeout)
 
         return result.strip('\r\n')
 
@@ -750,79 +932,118 @@ class CRTSession(Session):
         :param filename: A string with the absolute path to the filename to be written.
         :type filename: str
         """
-        self.logger.debug("<WRITE_FILE> Call to write_output_to_file with command: {0}, filename: {0}"
-                          .format(command, filename))
+        self.logger.debug("<WRITE_FILE> Call to write_output_to_file with command: %s, filename: %s",
+                          command, filename)
         self.script.validate_dir(os.path.dirname(filename), prompt_to_create=prompt_to_create)
-        self.logger.debug("<WRITE_FILE> Using filename: {0}".format(filename))
-
-        # RegEx to match the whitespace and backspace commands after --More-- prompt
-        exp_more = r' [\b]+[ ]+[\b]+(?P<line>.*)'
-        re_more = re.compile(exp_more)
-
-        # The different types of lines we want to match (MatchIndex) and treat differently
-        # MOD-GROGIER handle AireOS
-        if self.os == "AireOS":
-            matches = [self.prompt, "\r\n", '\r', '\n',
-                       'Press Enter to continue...',
-                       'Press Enter to continue or <[Cc]trl-[Zz]> to abort',
-                       '--More or (q)uit current module or <[Cc]trl-[Zz]> to abort', '--More-- or (q)uit']
-        elif self.os == "IOS" or self.os == "NXOS":
-            matches = [self.prompt, "\r\n", '\r', '\n', '--More--']
-        elif self.os == "ASA":
-            matches = [self.prompt, "\r\n", '\r', '\n', '<--- More --->']
-        else:
-            matches = [self.prompt, "\r\n", '\r', '\n', '--More--']
+        self.logger.debug("<WRITE_FILE> Using filename: %s", filename)
 
         # Write the output to the specified file
         try:
             # Need the 'b' in mode 'wb', or else Windows systems add extra blank lines.
-            with open(filename, 'ab') as newfile:
-                self.__send(command + "\n")
-
-                # Loop to capture every line of the command.  If we get CRLF (first entry in our "endings" list), then
-                # write that line to the file.  If we get our prompt back (which won't have CRLF), break the loop b/c we
-                # found the end of the output.
-                while True:
-                    nextline = self.screen.ReadString(matches, self.response_timeout)
-                    # If the match was the 1st index in the endings list -> \r\n
-                    if self.screen.MatchIndex == 0:
-                        raise InteractionError("Timeout trying to capture output")
-                    elif self.screen.MatchIndex == 1:
-                        # We got our prompt, so break the loop
-                        break
-                    elif self.screen.MatchIndex <= 4:
-                        # Strip newlines from front and back of line.
-                        nextline = nextline.strip('\r\n')
-                        # If there is something left, write it.
-                        if nextline != "":
-                            # Check for backspace and spaces after --More-- prompt and strip them out if needed.
-                            regex = re_more.match(nextline)
-                            if regex:
-                                nextline = regex.group('line')
-                            # Strip line endings from line.  Also re-encode line as ASCII
-                            # and ignore the character if it can't be done (rare error on
-                            # Nexus)
-                            newfile.write(nextline.strip('\r\n').encode('ascii', 'ignore') + "\n")
-                            self.logger.debug("<WRITE_FILE> Writing Line: {0}".format(nextline.strip('\r\n')
-                                                                                      .encode('ascii', 'ignore')))
-                    elif self.screen.MatchIndex > 4:
-                        # If we get a --More-- send a space character
-                        self.screen.Send(" ")
-                    else:
-                        raise InteractionError("Timeout trying to capture output")
+            with open(filename, 'ab', _FILE_BUFFER_SIZE) as newfile:
+                self.__capture_output(command, newfile.write)
 
         except IOError, err:
             error_str = "IO Error for:\n{0}\n\n{1}".format(filename, err)
             self.script.message_box(error_str, "IO Error", ICON_STOP)
 
+    def __capture_output(self, command, write):
+        """
+        Sends the supplied command to the remote device and captures the output line by line until the prompt is
+        returned.  Captured lines are collected in a buffer and passed to the write function in large chunks.
+
+        :param command: The command to be sent to the device
+        :type command: str
+        :param write: A function that accepts each chunk of output (for example, the write method of a file)
+        :type write: function
+        """
+        # The different types of lines we want to match (MatchIndex) and treat differently.  If paging is turned off
+        # there won't be any "--More--" prompts, so only the prompt and line endings need to be matched.
+        matches = [self.prompt] + _OUTPUT_MATCHES.get(self.os, _DEFAULT_OUTPUT_MATCHES)
+        if self.paging_disabled:
+            matches = matches[:4]
+
+        self.__send(command + "\n")
+
+        # If paging is off, the output can be read up to the prompt in large chunks instead of line by line.  When the
+        # timeout is reached, ReadString returns whatever was received so far, so a long output is read over several
+        # calls.  Only a timeout with no new output at all is treated as a failure.
+        if self.paging_disabled and self.script.bulk_capture:
+            partial = ""
+            while True:
+                output = partial + self._screen_read_string([self.prompt], self.response_timeout)
+                found_prompt = self.screen.MatchIndex != 0
+                if found_prompt:
+                    partial = ""
+                elif len(output) == len(partial):
+                    raise InteractionError("Timeout trying to capture output")
+                else:
+                    # Hold back the last (possibly incomplete) line until the rest of it is read.
+                    end = output.rfind("\n") + 1
+                    output, partial = output[:end], output[end:]
+                lines = [line for line in output.splitlines() if line]
+                if lines:
+                    write(_encode_lines(lines))
+                if found_prompt:
+                    return
+
+        # Local references for the lookups made on every line of output.
+        screen = self.screen
+        read_string = self._screen_read_string
+        more_match = _RE_MORE.match
+        timeout = self.response_timeout
+        log_lines = self.logger.isEnabledFor(logging.DEBUG)
+
+        # Loop to capture every line of the command.  If we get CRLF (first entry in our "endings" list), then
+        # add that line to the buffer, which is written out in large chunks.  If we get our prompt back
+        # (which won't have CRLF), break the loop b/c we found the end of the output.
+        lines = []
+        buffered = 0
+        try:
+            while True:
+                nextline = read_string(matches, timeout)
+                match_index = screen.MatchIndex
+                # If the match was the 1st index in the endings list -> \r\n
+                if match_index == 0:
+                    raise InteractionError("Timeout trying to capture output")
+                elif match_index == 1:
+                    # We got our prompt, so break the loop
+                    break
+                elif match_index <= 4:
+                    # Strip newlines from front and back of line.
+                    nextline = nextline.strip('\r\n')
+                    # If there is something left, buffer it.
+                    if nextline != "":
+                        # Check for backspace and spaces after --More-- prompt and strip them out if needed.
+                        regex = more_match(nextline)
+                        if regex:
+                            nextline = regex.group('line').strip('\r\n')
+                        lines.append(nextline)
+                        buffered += len(nextline) + 1
+                        if buffered >= _WRITE_BUFFER_SIZE:
+                            write(_encode_lines(lines))
+                            del lines[:]
+                            buffered = 0
+                        if log_lines:
+                            self.logger.debug("<WRITE_FILE> Writing Line: %s", nextline)
+                elif match_index > 4:
+                    # If we get a --More-- send a space character
+                    self._screen_send(" ")
+                else:
+                    raise InteractionError("Timeout trying to capture output")
+        finally:
+            # Write anything left in the buffer, even if the capture failed part way through.
+            if lines:
+                write(_encode_lines(lines))
+
     def get_command_output(self, command):
         """
         Captures the output from the provided command and saves the results in a variable.
 
         ** NOTE ** Assigning the output directly to a variable causes problems with SecureCRT for long outputs.  It
         will gradually get slower and slower until the program freezes and crashes.  The workaround is to
-        save the output directly to a file (line by line), and then read it back into a variable.  This is the
-        procedure that this method uses.
+        capture the output line by line (the same way write_output_to_file does) into a buffer in memory.  When
+        debug mode is enabled, a copy of the output is also saved to a file in the debug directory.
 
         Keyword Arguments:
             :param command: Command string that should be sent to the device
@@ -831,30 +1052,23 @@ class CRTSession(Session):
         :return: The result from issuing the above command.
         :rtype: str
         """
-        self.logger.debug("<GET OUTPUT> Running get_command_output with input '{0}'".format(command))
+        self.logger.debug("<GET OUTPUT> Running get_command_output with input '%s'", command)
 
-        # Create a temporary filename
-        temp_filename = self.create_output_filename("{0}-temp".format(command))
-        self.logger.debug("<GET OUTPUT> Temp Filename".format(temp_filename))
+        output = bytearray()
+        self.__capture_output(command, output.extend)
+        result = str(output)
 
-        self.write_output_to_file(command, temp_filename)
-
-        with open(temp_filename, 'r') as temp_file:
-            result = temp_file.read()
+        # If debug mode is enabled, save a copy of the output to the debug directory.
+        if self.script.debug_mode:
+            debug_filename = self.create_output_filename("{0}-temp".format(command), base_dir=self.script.debug_dir)
+            self.logger.debug("<GET OUTPUT> Saving output to %s", debug_filename)
+            with open(debug_filename, 'wb', _FILE_BUFFER_SIZE) as debug_file:
+                debug_file.write(result)
 
-        # If debug mode is enabled, save temporary file to the debug directory.
-        if self.script.settings.getboolean("Global", "debug_mode"):
-            filename = os.path.split(temp_filename)[1]
-            new_filename = os.path.join(self.script.debug_dir, filename)
-            self.logger.debug("<GET OUTPUT> Moving temp file to {0}".format(new_filename))
-            os.rename(temp_filename, new_filename)
-        else:
-            self.logger.debug("<GET OUTPUT> Deleting {0}".format(temp_filename))
-            os.remove(temp_filename)
-        self.logger.debug("<GET OUTPUT> Returning results of size {0}".format(sys.getsizeof(result)))
+        self.logger.debug("<GET OUTPUT> Returning results of size %s", sys.getsizeof(result))
         return result
 
-    def send_config_commands(self, command_list, output_filename=None):
+    def send_config_commands(self, command_list, output_filename=None, strict=True):
         """
         This method accepts a list of strings, where each string is a command to be sent to the device.
 
@@ -870,31 +1084,58 @@ class CRTSession(Session):
         :param output_filename: (Optional) If a absolute path to a file is specified, the config session output from
                                 applying the commands will be written to this file.
         :type output_filename: str
+        :param strict: If True (default), each command is sent separately and the config prompt must be received
+                       before the next command is sent.  If False, all commands are sent at once and only the final
+                       prompt is waited for.  This is faster for long command lists, but a device with a small input
+                       buffer may drop commands, and errors are only found after every command has been sent.
+        :type strict: bool
         """
         self.logger.debug("<SEND_CMDS> Preparing to write commands to device.")
-        self.logger.debug("<SEND_CMDS> Received: {0}".format(str(command_list)))
+        self.logger.debug("<SEND_CMDS> Received: %s", command_list)
 
         # Build text commands to send to device, and book-end with "conf t" and "end"
-        config_results = ""
-        command_list.insert(0, "configure terminal")
-
-        for command in command_list:
-            self.screen.Send("{0}\n".format(command))
-            output = self.screen.ReadString(")#", self.response_timeout)
-            if output:
-                config_results += "{0})#".format(output)
-            else:
-                error = "Did not receive expected prompt after issuing command: {0}".format(command)
-                self.logger.debug("<SEND_CMDS> {0}".format(error))
-                raise InteractionError("{0}".format(error))
+        config_commands = ["configure terminal"] + list(command_list)
 
-        self.screen.Send("end\n")
-        output = self.screen.ReadString(self.prompt, self.response_timeout)
-        config_results += "{0}{1}".format(output, self.prompt)
+        # The config session output is written to the file as it is received, with carriage returns and any non-ASCII
+        # characters removed.
+        if output_filename:
+            self.logger.debug("<SEND_CMDS> Writing config session output to: %s", output_filename)
+            output_file = open(output_filename, 'wb', _FILE_BUFFER_SIZE)
+        else:
+            output_file = None
 
-        with open(output_filename, 'w') as output_file:
-            self.logger.debug("<SEND_CMDS> Writing config session output to: {0}".format(output_filename))
-            output_file.write(config_results.replace("\r", ""))
+        try:
+            if strict:
+                for command in config_commands:
+                    self._screen_send("{0}\n".format(command))
+                    output = self._screen_read_string(")#", self.response_timeout)
+                    if output:
+                        if output_file:
+                            output_file.write(output.replace("\r", "").encode('ascii', 'ignore'))
+                            output_file.write(")#")
+                    else:
+                        error = "Did not receive expected prompt after issuing command: {0}".format(command)
+                        self.logger.debug("<SEND_CMDS> %s", error)
+                        raise InteractionError("{0}".format(error))
+
+                self._screen_send("end\n")
+                output = self._screen_read_string(self.prompt, self.response_timeout)
+            else:
+                # Send every command in one block and let the device work through them, only waiting for the prompt
+                # that comes back after "end".
+                config_commands.append("end")
+                self._screen_send("\n".join(config_commands) + "\n")
+                output = self._screen_read_string(self.prompt, self.response_timeout)
+                if not output:
+                    error = "Did not receive expected prompt after sending configuration commands."
+                    self.logger.debug("<SEND_CMDS> %s", error)
+                    raise InteractionError(error)
+            if output_file:
+                output_file.write(output.replace("\r", "").encode('ascii', 'ignore'))
+                output_file.write(self.prompt.encode('ascii', 'ignore'))
+        finally:
+            if output_file:
+                output_file.close()
 
     def save(self, command="copy running-config startup-config"):
         """
@@ -904,8 +1145,8 @@ class CRTSession(Session):
         self.__send("{0}\n".format(command))
         save_results = self.__wait_for_strings(["?", self.prompt])
         if save_results == 1:
-            self.screen.Send("\n")
-        self.logger.debug("<SAVE> Save results: {0}".format(save_results))
+            self._screen_send("\n")
+        self.logger.debug("<SAVE> Save results: %s", save_results)
 
 
 class DebugSession(Session):
@@ -928,6 +1169,9 @@ class DebugSession(Session):
         while response.lower() not in valid_response:
             response = raw_input("Is this device already connected?({0}): ".format(str(valid_response)))
 
+        # Files that were given as the output of each command, so the same command doesn't prompt again.
+        self._input_files = {}
+
         if response.lower() == "yes":
             self.logger.debug("<INIT> Assuming session is already connected")
             self._connected = True
@@ -987,21 +1231,21 @@ class DebugSession(Session):
         else:
             self.prompt = "DebugHost#"
             self.hostname = self.prompt[:-1]
-        self.logger.debug("<START> Set Hostname: {0}".format(self.hostname))
+        self.logger.debug("<START> Set Hostname: %s", self.hostname)
 
         # Detect the OS of the device, because outputs will differ per OS
         valid_os = ["AireOS", "IOS", "IOS-XR", "NXOS", "ASA"]
         response = ""
         while response not in valid_os:
             response = raw_input("Select OS ({0}): ".format(str(valid_os)))
-        self.logger.debug("<INIT> Setting OS to {0}".format(response))
+        self.logger.debug("<INIT> Setting OS to %s", response)
         self.os = response
 
         # Get terminal length and width, so we can revert back after changing them.
         self.term_len, self.term_width = None, None
 
         # If modify_term setting is True, then prevent "--More--" prompt (length) and wrapping of lines (width)
-        if self.script.settings.getboolean("Global", "modify_term"):
+        if self.script.modify_term:
             self.logger.debug("<START> Pretending to modify term setting.")
 
     def end_cisco_session(self):
@@ -1036,30 +1280,47 @@ class DebugSession(Session):
         :param filename: A string with the absolute path to the filename to be written.
         :type filename: str
         """
-        input_filename = ""
-        while not os.path.isfile(input_filename):
-            input_filename = raw_input("Path to file with output from '{0}' ('q' to quit): ".format(command))
-            if input_filename == 'q':
-                exit(0)
-            elif not os.path.isfile(input_filename):
-                print "Invalid File, please try again..."
-
-        with open(input_filename, 'r') as input_file:
-            input_data = input_file.readlines()
-
-        self.logger.debug("<WRITE OUTPUT> Call to write_output_to_file with command: {0}, filename: {1}"
-                          .format(command, filename))
+        # Read the whole file at once and drop carriage returns and non-ASCII characters in a single pass, then
+        # give every line (including the last one) a CRLF ending.  The file is opened directly (instead of checking
+        # that it exists first) and the user is asked again if that fails.
+        command_key = command.strip()
+        input_filename = self._input_files.get(command_key)
+        if input_filename:
+            self.logger.debug("<WRITE OUTPUT> Using previously supplied file: %s", input_filename)
+        input_data = None
+        while input_data is None:
+            if not input_filename:
+                input_filename = raw_input("Path to file with output from '{0}' ('q' to quit): ".format(command))
+                if input_filename == 'q':
+                    exit(0)
+            try:
+                with open(input_filename, 'rb') as input_file:
+                    input_data = input_file.read().translate(None, _CR_AND_NON_ASCII)
+            except (IOError, OSError):
+                if command_key not in self._input_files:
+                    print "Invalid File, please try again..."
+                self._input_files.pop(command_key, None)
+                input_filename = None
+        self._input_files[command_key] = input_filename
+
+        if input_data:
+            input_data = input_data.replace("\n", "\r\n")
+            if not input_data.endswith("\r\n"):
+                input_data += "\r\n"
+
+        self.logger.debug("<WRITE OUTPUT> Call to write_output_to_file with command: %s, filename: %s",
+                          command, filename)
         self.script.validate_dir(os.path.dirname(filename), prompt_to_create=prompt_to_create)
-        self.logger.debug("<WRITE OUTPUT> Using filename: {0}".format(filename))
+        self.logger.debug("<WRITE OUTPUT> Using filename: %s", filename)
 
         # Write the output to the specified file
         try:
             # Need the 'b' in mode 'wb', or else Windows systems add extra blank lines.
-            with open(filename, 'wb') as newfile:
-                for line in input_data:
-                    newfile.write(line.strip('\r\n').encode('ascii', 'ignore') + "\r\n")
-                    self.logger.debug("<WRITE OUTPUT> Writing Line: {0}".format(line.strip('\r\n')
-                                                                                .encode('ascii', 'ignore')))
+            with open(filename, 'wb', _FILE_BUFFER_SIZE) as newfile:
+                newfile.write(input_data)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    for line in input_data.splitlines():
+                        self.logger.debug("<WRITE OUTPUT> Writing Line: %s", line)
         except IOError, err:
             error_str = "IO Error for:\n{0}\n\n{1}".format(filename, err)
             self.script.message_box(error_str, "IO Error", ICON_STOP)
@@ -1080,26 +1341,23 @@ class DebugSession(Session):
         :return: The result from issuing the above command.
         :rtype: str
         """
-        self.logger.debug("<GET OUTPUT> Running get_command_output with input {0}".format(command))
-        # Create a temporary filename
-        temp_filename = self.create_output_filename("{0}-temp".format(command))
-        self.logger.debug("<GET OUTPUT> Temp Filename".format(temp_filename))
-        self.write_output_to_file(command, temp_filename)
-        with open(temp_filename, 'r') as temp_file:
-            result = temp_file.read()
-
-        if self.script.settings.getboolean("Global", "debug_mode"):
-            filename = os.path.split(temp_filename)[1]
-            new_filename = os.path.join(self.script.debug_dir, filename)
-            self.logger.debug("<GET OUTPUT> Moving temp file to {0}".format(new_filename))
-            os.rename(temp_filename, new_filename)
+        self.logger.debug("<GET OUTPUT> Running get_command_output with input %s", command)
+        # Create a temporary filename.  In debug mode it is created in the debug directory, where it is kept.
+        if self.script.debug_mode:
+            temp_filename = self.create_output_filename("{0}-temp".format(command), base_dir=self.script.debug_dir)
         else:
-            self.logger.debug("<GET OUTPUT> Deleting {0}".format(temp_filename))
+            temp_filename = self.create_output_filename("{0}-temp".format(command))
+        self.logger.debug("<GET OUTPUT> Temp Filename: %s", temp_filename)
+        self.write_output_to_file(command, temp_filename)
+        result = _read_file(temp_filename)
+
+        if not self.script.debug_mode:
+            self.logger.debug("<GET OUTPUT> Deleting %s", temp_filename)
             os.remove(temp_filename)
-        self.logger.debug("<GET OUTPUT> Returning results of size {0}".format(sys.getsizeof(result)))
+        self.logger.debug("<GET OUTPUT> Returning results of size %s", sys.getsizeof(result))
         return result
 
-    def send_config_commands(self, command_list, output_filename=None):
+    def send_config_commands(self, command_list, output_filename=None, strict=True):
         """
         This method accepts a list of strings, where each string is a command to be sent to the device.
 
@@ -1113,24 +1371,26 @@ class DebugSession(Session):
         :param output_filename: (Optional) If a absolute path to a file is specified, the config session output from
                                 applying the commands will be written to this file.
         :type output_filename: str
+        :param strict: If True (default), each command is sent separately and the config prompt must be received
+                       before the next command is sent.  If False, all commands are sent at once and only the final
+                       prompt is waited for.  This is faster for long command lists, but a device with a small input
+                       buffer may drop commands, and errors are only found after every command has been sent.
+        :type strict: bool
         """
         self.logger.debug("<SEND CONFIG> Preparing to write commands to device.")
-        self.logger.debug("<SEND CONFIG> Received: {0}".format(str(command_list)))
+        self.logger.debug("<SEND CONFIG> Received: %s", command_list)
 
-        command_string = ""
-        command_string += "configure terminal\n"
-        for command in command_list:
-            command_string += "{0}\n".format(command.strip())
-        command_string += "end\n"
+        config_commands = ["configure terminal"] + [command.strip() for command in command_list] + ["end"]
+        command_string = "\n".join(config_commands) + "\n"
 
-        self.logger.debug("<SEND CONFIG> Final command list:\n {0}".format(command_string))
+        self.logger.debug("<SEND CONFIG> Final command list:\n %s", command_string)
 
         if not output_filename:
             output_filename = self.create_output_filename("CONFIG_RESULT")
 
         config_results = command_string
-        with open(output_filename, 'w') as output_file:
-            self.logger.debug("<SEND CONFIG> Writing output to: {0}".format(output_filename))
+        with open(output_filename, 'wb', _FILE_BUFFER_SIZE) as output_file:
+            self.logger.debug("<SEND CONFIG> Writing output to: %s", output_filename)
             output_file.write("{0}{1}".format(self.prompt, config_results))
 
     def save(self, command="copy running-config startup-config"):
@@ -8,6 +8,8 @@ class SettingsImporter:
     """
     def __init__(self, settings_file, create=False):
         self.settings_file = settings_file
+        # Values that have already been read, keyed by (parser method, section, setting).  Cleared by update().
+        self._values = {}
 
         # Load Defaults
         default_settings_filename = "default_settings.ini"
@@ -88,7 +90,26 @@ class SettingsImporter:
         :return: The value of the setting requested
         :rtype: str
         """
-        return self.config.get(section, setting)
+        return self._lookup("get", section, setting)
+
+    def _lookup(self, method, section, setting):
+        """
+        Returns a setting using the named ConfigParser method (get, getboolean or getint), remembering the result so
+        that reading the same setting again doesn't go back through the parser.
+
+        :param method: The name of the ConfigParser method used to read the setting
+        :type method: str
+        :param section: The section of the settings file where the setting can be found.
+        :type section: str
+        :param setting: The name of the setting we want to retrieve
+        :type setting: str
+
+        :return: The value of the setting requested
+        """
+        key = (method, section, setting)
+        if key not in self._values:
+            self._values[key] = getattr(self.config, method)(section, setting)
+        return self._values[key]
 
     def update(self, section, setting, value):
         """
@@ -102,6 +123,7 @@ class SettingsImporter:
         :type value: str
         """
         self.config.set(section, setting, value)
+        self._values.clear()
         with open(self.settings_file, 'w') as settings_updates:
             self.config.write(settings_updates)
 
@@ -117,7 +139,21 @@ class SettingsImporter:
         :return: The value of the setting requested as a boolean
         :rtype: bool
         """
-        return self.config.getboolean(section, setting)
+        return self._lookup("getboolean", section, setting)
+
+    def getbooleans(self, section, *settings):
+        """
+        A wrapper function to retrieve several settings from the same section as boolean values in a single call.
+
+        :param section: The section of the settings file where the settings can be found.
+        :type section: str
+        :param settings: The names of the settings we want to retrieve
+        :type settings: str
+
+        :return: The values of the settings requested as booleans, in the same order as the names.
+        :rtype: list of bool
+        """
+        return [self._lookup("getboolean", section, setting) for setting in settings]
 
     def getint(self, section, setting):
         """
@@ -131,7 +167,7 @@ class SettingsImporter:
         :return: The value of the setting requested as an integer
         :rtype: int
         """
-        return self.config.getint(section, setting)
+        return self._lookup("getint", section, setting)
 
     def getlist(self, section, setting):
         """
@@ -147,6 +183,6 @@ class SettingsImporter:
         :rtype: int
         """
         # Get the raw string from the settings file.
-        raw_setting = self.config.get(section, setting)
+        raw_setting = self.get(section, setting)
         # Split the raw string on the comma, and save each item as an entry into the list, while removing
         return filter(None, map(lambda x: x.strip(), raw_setting.split(',')))
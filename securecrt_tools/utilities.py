@@ -36,17 +36,17 @@ def textfsm_parse_to_list(input_data, template_name, add_header=False):
 
     logger.debug("Preparing to process with TextFSM and return a list of lists")
     # Create file object to the TextFSM template and create TextFSM object.
-    logger.debug("Using template at: {0}".format(template_name))
+    logger.debug("Using template at: %s", template_name)
     with open(template_name, 'r') as template:
         fsm_table = textfsm.TextFSM(template)
 
     # Process our raw data vs the template with TextFSM
     output = fsm_table.ParseText(input_data)
-    logger.debug("TextFSM returned a list of size: '{0}'".format(len(output)))
+    logger.debug("TextFSM returned a list of size: '%s'", len(output))
 
     # Insert a header row into the list, so that when output to a CSV there is a header row.
     if add_header:
-        logger.debug("'Adding header '{0}' to start of output list.".format(fsm_table.header))
+        logger.debug("'Adding header '%s' to start of output list.", fsm_table.header)
         output.insert(0, fsm_table.header)
 
     return output
@@ -64,13 +64,13 @@ def textfsm_parse_to_dict(input_data, template_filename):
 
     logger.debug("Preparing to process with TextFSM and return a list of dictionaries.")
     # Create file object to the TextFSM template and create TextFSM object.
-    logger.debug("Using template at: {0}".format(template_filename))
+    logger.debug("Using template at: %s", template_filename)
     with open(template_filename, 'r') as template:
         fsm_table = textfsm.TextFSM(template)
 
     # Process our raw data vs the template with TextFSM
     fsm_list = fsm_table.ParseText(input_data)
-    logger.debug("TextFSM returned a list of size: '{0}'".format(len(fsm_list)))
+    logger.debug("TextFSM returned a list of size: '%s'", len(fsm_list))
 
     # Insert a header row into the list, so that when output to a CSV there is a header row.
     header_list = fsm_table.header
@@ -81,7 +81,7 @@ def textfsm_parse_to_dict(input_data, template_filename):
         dict_entry = dict(zip(header_list, entry))
         output.append(dict_entry)
 
-    logger.debug("Converted all sub-lists to dicts.  Size is {0}".format(len(output)))
+    logger.debug("Converted all sub-lists to dicts.  Size is %s", len(output))
     return output
 
 
@@ -101,16 +101,18 @@ def list_of_lists_to_csv(data, filename):
                             the global settings.
     """
     # Validate path before creating file.
-    logger.debug("Opening file {0} for writing".format(filename))
+    logger.debug("Opening file %s for writing", filename)
     with open(filename, 'wb') as output_csv:
         # Binary mode required ('wb') to prevent Windows from adding linefeeds after each line.
         csv_out = csv.writer(output_csv)
+        log_rows = logger.isEnabledFor(logging.DEBUG)
         for line in data:
-            logger.debug("Writing row: '{0}'".format(line))
+            if log_rows:
+                logger.debug("Writing row: '%s'", line)
             # Convert every string on the list to utf-8, skipping attempt if value is None
             encoded_line = [str(x).encode('utf-8', 'ignore') if x else None for x in line]
             csv_out.writerow(encoded_line)
-    logger.debug("Completed writing to file {0}".format(filename))
+    logger.debug("Completed writing to file %s", filename)
 
 
 def list_of_dicts_to_csv(data, filename, header, add_header=True):
@@ -122,14 +124,14 @@ def list_of_dicts_to_csv(data, filename, header, add_header=True):
     :return:
     """
     # Validate path before creating file.
-    logger.debug("Opening file {0} for writing".format(filename))
+    logger.debug("Opening file %s for writing", filename)
     with open(filename, 'wb') as output_csv:
         csv_writer = csv.DictWriter(output_csv, fieldnames=header)
         if add_header:
             csv_writer.writeheader()
         for entry in data:
             csv_writer.writerow(entry)
-    logger.debug("Completed writing to file {0}".format(filename))
+    logger.debug("Completed writing to file %s", filename)
 
 
 def extract_system_name(device_id, strip_list=[]):
@@ -151,7 +153,7 @@ def extract_system_name(device_id, strip_list=[]):
 
     # If we find an open paren, then we either have "SYSTEM_NAME(SERIAL)" or "SERIAL(SYSTEM-NAME)" format.  The latter
     # format is often seen in older devices.  Determine which is the system_name by matching regex for a Cisco serial.
-    logger.debug("Analyzing '{0}".format(device_id))
+    logger.debug("Analyzing '%s", device_id)
     if "(" in device_id:
         logger.debug("Found '(' in device_id.")
         left, right = device_id.split('(')
@@ -160,10 +162,10 @@ def extract_system_name(device_id, strip_list=[]):
         right_serial = re_serial.match(right)
         if right_serial:
             system_name = left
-            logger.debug("Detected right side ({0}) is a serial number.".format(right))
+            logger.debug("Detected right side (%s) is a serial number.", right)
         elif left_serial:
             system_name = right
-            logger.debug("Detected left side ({0}) is a serial number.".format(left))
+            logger.debug("Detected left side (%s) is a serial number.", left)
         else:
             system_name = device_id
             logger.debug("Didn't find anything to remove.")
@@ -176,12 +178,12 @@ def extract_system_name(device_id, strip_list=[]):
         is_ip = re_ip.match(system_name)
         # Some device return IP as device_id.  In those cases, just return IP -- don't treat it like FQDN
         if is_ip:
-            logger.debug("Device ID is an IP address ({0})".format(device_id))
+            logger.debug("Device ID is an IP address (%s)", device_id)
             return system_name
         else:
             for item in strip_list:
                 if item in system_name:
-                    logger.debug("Stripping '{0}' from {1}".format(item, system_name))
+                    logger.debug("Stripping '%s' from %s", item, system_name)
                     system_name = system_name.replace(item, '')
             return system_name
     else:
@@ -0,0 +1,394 @@
+"""
+Tests for the CRTScript class, run against a minimal fake of the SecureCRT object model.  These need Python 2.7, like
+the rest of the package:
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import logging
+import shutil
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from securecrt_tools import scripts
+from securecrt_tools import sessions
+
+
+# ################################################   FAKE SECURECRT   #################################################
+
+
+class FakeScreen(object):
+    """
+    Echoes whatever is sent to it and prints the device prompt after every line.  If login prompts are given, the
+    first is printed instead of the device prompt and each following one is printed after a line is sent.  A silent
+    screen shows the device prompt but ignores anything that is sent.  The echo of the first "delayed_sends" sends is
+    held back until the next send, like a device that is still busy printing a banner.
+    """
+    def __init__(self, host, login_prompts=(), silent=False):
+        self.prompt = host + "#"
+        self.silent = silent
+        self.delayed_sends = 0
+        self.held = ""
+        self.login_prompts = list(login_prompts)
+        self.buffer = self.login_prompts.pop(0) if self.login_prompts else self.prompt
+        self.Synchronous = False
+        self.IgnoreEscape = False
+        self.MatchIndex = 0
+
+    def Send(self, text):
+        if self.silent:
+            return
+        if self.delayed_sends:
+            self.delayed_sends -= 1
+            self.held += text
+            return
+        text, self.held = self.held + text, ""
+        for char in text:
+            if char in "\r\n":
+                self.buffer += "\r\n" + (self.login_prompts.pop(0) if self.login_prompts else self.prompt)
+            else:
+                self.buffer += char
+
+    def WaitForString(self, target, timeout=0):
+        return self.WaitForStrings([target], timeout)
+
+    def WaitForStrings(self, targets, timeout=0):
+        if isinstance(targets, basestring):
+            targets = [targets]
+        found = [(self.buffer.find(target), index, target) for index, target in enumerate(targets)]
+        found = [match for match in found if match[0] >= 0]
+        if not found:
+            self.MatchIndex = 0
+            return 0
+        position, index, target = min(found)
+        self.buffer = self.buffer[position + len(target):]
+        self.MatchIndex = index + 1
+        return index + 1
+
+    def ReadString(self, targets, timeout=0, milliseconds=False):
+        # Like SecureCRT, returns what was read before the matched string, without the string itself.
+        if isinstance(targets, basestring):
+            targets = [targets]
+        before = self.buffer
+        if not self.WaitForStrings(targets, timeout):
+            return ""
+        return before[:len(before) - len(self.buffer) - len(targets[self.MatchIndex - 1])]
+
+
+class FakeSession(object):
+    def __init__(self, crt, connected):
+        self.crt = crt
+        self.Connected = connected
+
+    def ConnectInTab(self, connect_string, wait=True):
+        return self.crt.open_tab(connect_string)
+
+    def Disconnect(self):
+        self.Connected = 0
+
+
+class FakeTab(object):
+    def __init__(self, crt, index, host, connected, login_prompts=(), silent=False):
+        self.Index = index
+        self.host = host
+        self.Screen = FakeScreen(host, login_prompts, silent)
+        self.Session = FakeSession(crt, connected)
+        self.closed = False
+
+    def Close(self):
+        self.closed = True
+
+
+class FakeCrt(object):
+    """
+    Hosts listed in "unreachable" never finish connecting, hosts listed in "silent" connect but never respond, and
+    connection strings containing "/SSH2" fail for hosts listed in "no_ssh2".
+    """
+    def __init__(self, script_dir):
+        self.ScriptFullName = os.path.join(script_dir, "test_script.py")
+        self.tabs = [FakeTab(self, 0, "script-tab", 0)]
+        self.connect_strings = []
+        self.unreachable = set()
+        self.silent = set()
+        self.no_ssh2 = set()
+
+    def open_tab(self, connect_string):
+        self.connect_strings.append(connect_string)
+        host = connect_string.split()[-1]
+        if host in self.no_ssh2 and "/SSH2" in connect_string:
+            raise Exception("SSH2 refused")
+        login_prompts = ("Username: ", "Password: ", host + "#") if "/TELNET" in connect_string else ()
+        tab = FakeTab(self, len(self.tabs), host, 0 if host in self.unreachable else 1, login_prompts,
+                      host in self.silent)
+        self.tabs.append(tab)
+        return tab
+
+    def GetScriptTab(self):
+        return self.tabs[0]
+
+    def GetTab(self, index):
+        return self.tabs[index]
+
+    def GetLastErrorMessage(self):
+        return "Connection failed"
+
+
+# ################################################   TEST CASES   ####################################################
+
+
+class QuoteArgumentTests(unittest.TestCase):
+    def test_value_without_whitespace_is_unchanged(self):
+        self.assertEqual(scripts._quote_argument('pa"ss'), 'pa"ss')
+
+    def test_value_with_whitespace_is_quoted(self):
+        self.assertEqual(scripts._quote_argument("pa ss"), '"pa ss"')
+
+    def test_value_with_whitespace_and_quote_is_rejected(self):
+        self.assertRaises(scripts.ConnectError, scripts._quote_argument, 'pa"ss word')
+
+
+class FakeCrtTestCase(unittest.TestCase):
+    """
+    Creates a CRTScript for a fake SecureCRT, with a settings file in a temporary script directory.  Sub-classes can
+    turn on debug mode, or add lines to the [Global] section of the settings file with the "settings" attribute.
+    """
+    debug_mode = False
+    settings = ""
+
+    def setUp(self):
+        self.script_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.script_dir, "settings"))
+        os.makedirs(os.path.join(self.script_dir, "output", "debugs"))
+        with open(os.path.join(self.script_dir, "settings", "settings.ini"), "w") as settings_file:
+            settings_file.write("[Global]\noutput_dir = output\ndate_format = %Y-%m-%d\nmodify_term = True\n"
+                                "debug_mode = {0}\nuse_proxy = False\nproxy_session =\nresponse_timeout = 1\n"
+                                "{1}".format(self.debug_mode, self.settings))
+        # Connection timeouts are counted in sleeps, so they can run instantly.
+        self.sleep = time.sleep
+        time.sleep = lambda seconds: None
+        self.crt = FakeCrt(self.script_dir)
+        self.script = scripts.CRTScript(self.crt)
+
+    def tearDown(self):
+        time.sleep = self.sleep
+        logger = logging.getLogger("securecrt")
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
+        logger.propagate = True
+        scripts._debug_log_handlers.clear()
+        shutil.rmtree(self.script_dir)
+
+
+class SshInNewTabsTests(FakeCrtTestCase):
+    def device(self, hostname, protocol="ssh2", proxy=""):
+        return {'Hostname': hostname, 'Protocol': protocol, 'Username': "user", 'Password': "pass",
+                'Proxy Session': proxy}
+
+    def test_failed_login_yields_none(self):
+        self.crt.unreachable.add("r1")
+        devices = [self.device("r0"), self.device("r1"), self.device("r2")]
+
+        results = [(device['Hostname'], session is not None)
+                   for device, session in self.script.ssh_in_new_tabs(devices, max_tabs=1)]
+
+        self.assertEqual(results, [("r0", True), ("r1", False), ("r2", True)])
+        self.assertTrue(all(tab.closed for tab in self.crt.tabs[1:]))
+
+    def test_tab_that_fails_out_of_order(self):
+        self.crt.unreachable.add("r0")
+        self.crt.silent.add("r1")
+        devices = [self.device("r0"), self.device("r1"), self.device("r2")]
+
+        results = [(device['Hostname'], session is not None)
+                   for device, session in self.script.ssh_in_new_tabs(devices, max_tabs=3)]
+
+        # r1 and r2 connect before r0, and r1 fails the prompt check while r0 is still waiting to connect.
+        self.assertEqual(results, [("r1", False), ("r2", True), ("r0", False)])
+        self.assertTrue(all(tab.closed for tab in self.crt.tabs[1:]))
+
+    def test_protocol_and_proxy_are_used(self):
+        devices = [self.device("r0", protocol="telnet"), self.device("r1", proxy="jumpbox"),
+                   self.device("r2", protocol="ssh1")]
+
+        for device, session in self.script.ssh_in_new_tabs(devices):
+            self.assertTrue(session)
+
+        self.assertEqual(self.crt.connect_strings,
+                         ["/TELNET r0",
+                          "/FIREWALL=Session:\"jumpbox\" /SSH2 /ACCEPTHOSTKEYS /L user /PASSWORD pass r1",
+                          "/SSH1 /ACCEPTHOSTKEYS /L user /PASSWORD pass r2"])
+
+    def test_default_proxy_is_used_without_a_device_proxy(self):
+        devices = [self.device("r0"), self.device("r1", proxy="jumpbox")]
+
+        for device, session in self.script.ssh_in_new_tabs(devices, proxy="default"):
+            self.assertTrue(session)
+
+        self.assertEqual(self.crt.connect_strings,
+                         ["/FIREWALL=Session:\"default\" /SSH2 /ACCEPTHOSTKEYS /L user /PASSWORD pass r0",
+                          "/FIREWALL=Session:\"jumpbox\" /SSH2 /ACCEPTHOSTKEYS /L user /PASSWORD pass r1"])
+
+    def test_blank_protocol_falls_back_from_ssh2(self):
+        self.crt.no_ssh2.add("r0")
+
+        results = [(device['Hostname'], session is not None)
+                   for device, session in self.script.ssh_in_new_tabs([self.device("r0", protocol="")])]
+
+        self.assertEqual(results, [("r0", True)])
+        self.assertIn("/SSH1", self.crt.connect_strings[-1])
+
+    def test_stopping_early_closes_pending_tabs(self):
+        devices = [self.device("r{0}".format(index)) for index in range(4)]
+
+        for device, session in self.script.ssh_in_new_tabs(devices, max_tabs=3):
+            break
+
+        self.assertEqual(len(self.crt.tabs), 4)
+        self.assertTrue(all(tab.closed for tab in self.crt.tabs[1:]))
+
+
+class ConnectionPoolTests(FakeCrtTestCase):
+    settings = "reuse_connections = True\n"
+
+    def connect(self, host):
+        self.script.connect(host, "user", "pass", protocol="ssh2")
+        return self.crt.tabs[-1]
+
+    def test_connection_is_reused(self):
+        tab = self.connect("r1")
+        self.script.disconnect()
+
+        self.assertIs(self.connect("r1"), tab)
+        self.assertEqual(len(self.crt.connect_strings), 1)
+
+    def test_disconnected_connection_is_closed_and_replaced(self):
+        old_tab = self.connect("r1")
+        self.script.disconnect()
+        old_tab.Session.Connected = 0
+
+        new_tab = self.connect("r1")
+
+        self.assertIsNot(new_tab, old_tab)
+        self.assertTrue(old_tab.closed)
+        self.assertFalse(self.script.connection_pool)
+
+    def test_unresponsive_connection_is_closed_and_replaced(self):
+        old_tab = self.connect("r1")
+        self.script.disconnect()
+        old_tab.Screen.buffer = ""
+        old_tab.Screen.silent = True
+
+        new_tab = self.connect("r1")
+
+        self.assertIsNot(new_tab, old_tab)
+        self.assertTrue(old_tab.closed)
+        self.assertEqual(self.script.get_main_session().tab, new_tab)
+
+    def test_connection_is_kept_while_main_session_is_connected(self):
+        tab = self.connect("r1")
+        self.script.disconnect()
+        self.connect("r2")
+
+        self.assertRaises(scripts.ConnectError, self.connect, "r1")
+        self.assertFalse(tab.closed)
+        self.assertIn(("r1", "user", 2, None), self.script.connection_pool)
+
+    def test_least_recently_used_connection_is_closed(self):
+        tabs = []
+        for index in range(scripts._MAX_POOLED_TABS + 1):
+            tabs.append(self.connect("r{0}".format(index)))
+            self.script.disconnect()
+
+        self.assertEqual(len(self.script.connection_pool), scripts._MAX_POOLED_TABS)
+        self.assertTrue(tabs[0].closed)
+        self.assertFalse(any(tab.closed for tab in tabs[1:]))
+
+        self.script.close_connection_pool()
+        self.assertTrue(all(tab.closed for tab in tabs))
+
+
+class PostConnectCheckTests(FakeCrtTestCase):
+    def setUp(self):
+        super(PostConnectCheckTests, self).setUp()
+        self.tab = self.crt.open_tab("/SSH2 r1")
+        self.session = sessions.CRTSession(self.script, self.tab)
+
+    def check(self):
+        self.script._CRTScript__post_connect_check(["#"], session=self.session)
+
+    def test_test_string_is_resent_when_echo_is_late(self):
+        self.tab.Screen.buffer = "Long banner r1#\r\nr1#"
+        self.tab.Screen.delayed_sends = 1
+
+        self.check()
+
+        # The echo of the second attempt must not be left behind for the next read from the session.
+        self.assertNotIn(scripts._PROMPT_TEST_STRING, self.tab.Screen.buffer)
+
+    def test_error_names_the_test_string(self):
+        self.tab.Screen.buffer = "r1#" * scripts._PROMPT_TEST_ATTEMPTS
+        self.tab.Screen.silent = True
+
+        try:
+            self.check()
+        except sessions.InteractionError as e:
+            self.assertIn(scripts._PROMPT_TEST_STRING, str(e))
+        else:
+            self.fail("InteractionError not raised")
+
+
+class GetPromptTests(FakeCrtTestCase):
+    def setUp(self):
+        super(GetPromptTests, self).setUp()
+        self.tab = self.crt.open_tab("/SSH2 r1")
+        self.session = sessions.CRTSession(self.script, self.tab)
+
+    def test_prompt_is_found_when_echo_is_late(self):
+        self.tab.Screen.buffer = ""
+        self.tab.Screen.delayed_sends = 1
+
+        self.assertEqual(self.session._CRTSession__get_prompt(), "r1#")
+
+        # The echo of the resent test string must not be left behind for the next prompt-bounded read.
+        self.assertNotIn(sessions._PROMPT_TEST_STRING, self.tab.Screen.buffer)
+        self.assertNotIn("r1#", self.tab.Screen.buffer)
+
+
+class DebugLogTests(FakeCrtTestCase):
+    debug_mode = True
+
+    def read_log(self):
+        log_file = os.path.join(self.script_dir, "output", "debugs", "test_script-debug.txt")
+        with open(log_file) as debug_log:
+            return debug_log.read()
+
+    def test_one_handler_per_log_file(self):
+        scripts.CRTScript(self.crt)
+
+        self.assertEqual(len(logging.getLogger("securecrt").handlers), 1)
+
+    def test_warning_writes_buffered_messages(self):
+        logger = logging.getLogger("securecrt")
+        logger.debug("before the warning")
+        logger.warning("the warning")
+
+        log_text = self.read_log()
+        self.assertIn("before the warning", log_text)
+        self.assertIn("the warning", log_text)
+
+    def test_new_handler_after_logging_shutdown(self):
+        logging.shutdown()
+        scripts.CRTScript(self.crt)
+        logging.getLogger("securecrt").warning("after shutdown")
+
+        self.assertEqual(len(logging.getLogger("securecrt").handlers), 1)
+        self.assertIn("after shutdown", self.read_log())
+
+
+if __name__ == "__main__":
+    unittest.main()